@@ -6,6 +6,7 @@ This script modifies the dashboard app.py file to use our fixed data processing
 """
 import os
 import sys
+import mmap
 from pathlib import Path
 import logging
 import shutil
@@ -15,6 +16,27 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+ORIGINAL_IMPORT = b"from src.dashboard.utils.data_processing import process_data_for_display, get_key_metrics"
+FIXED_IMPORT = b"from src.dashboard.utils.data_processing_fix import process_data_for_display, get_key_metrics"
+
+def find_imports(file_path):
+    """
+    Check which version of the data_processing import a file contains.
+    
+    The file is memory-mapped and searched in place rather than read into memory.
+    
+    Args:
+        file_path: Path to the file to search
+        
+    Returns:
+        Tuple of (has fixed import, has original import)
+    """
+    if os.path.getsize(file_path) == 0:
+        return False, False
+    
+    with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm.find(FIXED_IMPORT) != -1, mm.find(ORIGINAL_IMPORT) != -1
+
 def apply_fix():
     """Apply the data processing fix to the dashboard."""
     project_root = Path(__file__).parent
@@ -24,33 +46,33 @@ def apply_fix():
         logger.error(f"Dashboard app not found at {dashboard_app_path}")
         return False
     
+    has_fix, has_original = find_imports(dashboard_app_path)
+    
+    # Nothing to do if already patched, so skip the backup and rewrite
+    if has_fix and not has_original:
+        logger.info("Data processing fix is already applied to dashboard app")
+        return True
+    
+    if not has_original:
+        logger.error("Could not find data_processing import in dashboard app")
+        return False
+    
     # Create backup
     backup_path = str(dashboard_app_path) + ".bak"
     shutil.copy2(dashboard_app_path, backup_path)
     logger.info(f"Created backup of dashboard app at {backup_path}")
     
     try:
-        # Read dashboard app content
-        with open(dashboard_app_path, "r") as f:
+        # The fixed import is longer than the original, so the file cannot be
+        # patched in place and is rewritten instead
+        with open(dashboard_app_path, "rb") as f:
             content = f.read()
         
-        # Replace import statement for data_processing
-        if "from src.dashboard.utils.data_processing import" in content:
-            # Update import to use our fixed version
-            updated_content = content.replace(
-                "from src.dashboard.utils.data_processing import process_data_for_display, get_key_metrics",
-                "from src.dashboard.utils.data_processing_fix import process_data_for_display, get_key_metrics"
-            )
-            
-            # Write updated content
-            with open(dashboard_app_path, "w") as f:
-                f.write(updated_content)
-            
-            logger.info("Successfully applied data processing fix to dashboard app")
-            return True
-        else:
-            logger.error("Could not find data_processing import in dashboard app")
-            return False
+        with open(dashboard_app_path, "wb") as f:
+            f.write(content.replace(ORIGINAL_IMPORT, FIXED_IMPORT))
+        
+        logger.info("Successfully applied data processing fix to dashboard app")
+        return True
     except Exception as e:
         logger.error(f"Error applying fix: {str(e)}")
         
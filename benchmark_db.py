@@ -5,12 +5,16 @@ This script benchmarks the performance of the optimized database manager
 against the original implementation.
 """
 
+import gc
+import sqlite3
 import time
 import logging
+from contextlib import closing
+from functools import partial
+from typing import Any, Callable, List, Tuple
 from pathlib import Path
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Set up logging
 logging.basicConfig(
@@ -22,43 +26,119 @@ logger = logging.getLogger(__name__)
 # Import both database implementations
 from src.database import db_manager
 from src.database import db_manager_optimized
+from src.database.db_manager import _sanitize_column_name
+from config.config import DATABASE_TABLE
+
+# Import the shared benchmark helpers
+from benchmark_utils import bench, save_results
 
 # Import file processing
 from src.data_processing.file_finder import find_underwriting_files
 from src.data_processing.excel_reader import process_excel_files
 
-def generate_test_data(num_rows: int) -> pd.DataFrame:
+# Category values for the generated test data, built once and frozen
+_STAGES = np.array(['Active UW', 'Closed', 'Realized'])
+_PROPERTY_TYPES = np.array(['Multifamily', 'Office', 'Retail', 'Industrial'])
+_MARKETS = np.array(['New York', 'Los Angeles', 'Chicago', 'Miami', 'Dallas'])
+_SUBMARKETS = np.array(['Downtown', 'Midtown', 'Uptown', 'Suburbs'])
+_DEAL_STATUS = np.array(['Pending', 'Closed', 'Failed'])
+_PROPERTY_CLASS = np.array(['A', 'B', 'C', 'D'])
+for _categories in (_STAGES, _PROPERTY_TYPES, _MARKETS, _SUBMARKETS, _DEAL_STATUS, _PROPERTY_CLASS):
+    _categories.setflags(write=False)
+
+def _draw(rng: np.random.Generator, categories: np.ndarray, size: int) -> np.ndarray:
+    """
+    Draw categorical values by indexing the categories with one bulk integer draw.
+    
+    Args:
+        rng: Random number generator
+        categories: Array of category values
+        size: Number of values to draw
+        
+    Returns:
+        Array of drawn values
+    """
+    return categories[rng.integers(0, len(categories), size)]
+
+def generate_test_data(num_rows: int, seed: int = 42) -> pd.DataFrame:
     """
     Generate test data for benchmarking.
     
     Args:
         num_rows: Number of rows to generate
+        seed: Random seed, so repeated runs benchmark the same data
         
     Returns:
         DataFrame with test data
     """
     logger.info(f"Generating {num_rows} rows of test data")
     
+    rng = np.random.default_rng(seed)
+    
+    # Build the string columns with vectorized NumPy operations rather than
+    # per-row Python loops
+    file_names = np.char.add(np.char.add("Test_File_", np.arange(num_rows).astype(str)), ".xlsb")
+    stages = _draw(rng, _STAGES, num_rows)
+    
     # Generate random data
     data = {
-        'File Name': [f"Test_File_{i}.xlsb" for i in range(num_rows)],
-        'Absolute File Path': [f"/test/path/Test_File_{i}.xlsb" for i in range(num_rows)],
-        'Deal Stage Subdirectory Name': np.random.choice(['Active UW', 'Closed', 'Realized'], num_rows),
-        'Deal Stage Subdirectory Path': [f"/test/path/{np.random.choice(['Active UW', 'Closed', 'Realized'])}" for i in range(num_rows)],
-        'Last Modified Date': pd.date_range(start='1/1/2024', periods=num_rows).strftime('%Y-%m-%d').tolist(),
-        'File Size in Bytes': np.random.randint(1000, 10000000, num_rows),
-        'Property Type': np.random.choice(['Multifamily', 'Office', 'Retail', 'Industrial'], num_rows),
-        'Market': np.random.choice(['New York', 'Los Angeles', 'Chicago', 'Miami', 'Dallas'], num_rows),
-        'Sub-Market': np.random.choice(['Downtown', 'Midtown', 'Uptown', 'Suburbs'], num_rows),
-        'Deal Status': np.random.choice(['Pending', 'Closed', 'Failed'], num_rows),
-        'Property Class': np.random.choice(['A', 'B', 'C', 'D'], num_rows),
-        'Property Value': np.random.uniform(1000000, 50000000, num_rows),
-        'Acquisition Price': np.random.uniform(800000, 40000000, num_rows),
-        'NOI': np.random.uniform(50000, 2000000, num_rows),
-        'Cap Rate': np.random.uniform(0.04, 0.08, num_rows),
+        'File Name': file_names,
+        'Absolute File Path': np.char.add("/test/path/", file_names),
+        'Deal Stage Subdirectory Name': stages,
+        'Deal Stage Subdirectory Path': np.char.add("/test/path/", stages),
+        'Last Modified Date': pd.date_range(start='1/1/2024', periods=num_rows),
+        'File Size in Bytes': rng.integers(1000, 10000000, num_rows),
+        'Property Type': _draw(rng, _PROPERTY_TYPES, num_rows),
+        'Market': _draw(rng, _MARKETS, num_rows),
+        'Sub-Market': _draw(rng, _SUBMARKETS, num_rows),
+        'Deal Status': _draw(rng, _DEAL_STATUS, num_rows),
+        'Property Class': _draw(rng, _PROPERTY_CLASS, num_rows),
+        'Property Value': rng.uniform(1000000, 50000000, num_rows),
+        'Acquisition Price': rng.uniform(800000, 40000000, num_rows),
+        'NOI': rng.uniform(50000, 2000000, num_rows),
+        'Cap Rate': rng.uniform(0.04, 0.08, num_rows),
     }
     
-    return pd.DataFrame(data)
+    # The columns are already NumPy arrays, so let pandas use them as-is
+    return pd.DataFrame(data, copy=False)
+
+def _measure(items: List[Tuple[str, Callable[[], Any], str]], results: dict,
+             repeat: int = 5, warmup: bool = True) -> dict:
+    """
+    Time each benchmark in a table, with garbage collection kept out of the timings.
+    
+    Args:
+        items: List of (result key, zero-argument callable, log label) tuples
+        results: Dictionary to store the timings in, keyed by result key
+        repeat: Number of timed runs per item
+        warmup: Whether to make one untimed call per item first
+        
+    Returns:
+        The results dictionary
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        for key, fn, label in items:
+            results[key] = bench(fn, repeat=repeat, warmup=warmup)
+            logger.info(f"{label}: {results[key]:.3f} seconds")
+            # Clear what this item left behind so it isn't collected during the next one
+            gc.collect()
+    finally:
+        gc.enable()
+    
+    return results
+
+def _pandas_insert(db_path: Path, df: pd.DataFrame) -> None:
+    """
+    Write a DataFrame with plain pandas multi-row INSERTs, as a baseline for unoptimized code.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        df: DataFrame to write
+    """
+    with closing(sqlite3.connect(db_path)) as conn:
+        df.to_sql(DATABASE_TABLE, conn, if_exists='append', index=False, method='multi', chunksize=500)
 
 def benchmark_insert(original_db_path: Path, optimized_db_path: Path, test_data: pd.DataFrame) -> dict:
     """
@@ -74,42 +154,22 @@ def benchmark_insert(original_db_path: Path, optimized_db_path: Path, test_data:
     """
     logger.info("Benchmarking insert operations")
     
-    results = {}
-    
-    # Original implementation
-    logger.info("Testing original implementation")
-    original_db = db_manager.DatabaseManager(original_db_path)
-    original_db.setup_database()
-    
-    start_time = time.time()
-    db_manager.store_data(test_data)
-    original_time = time.time() - start_time
-    
-    results['original_insert'] = original_time
-    logger.info(f"Original implementation: {original_time:.2f} seconds")
-    
-    # Optimized implementation
-    logger.info("Testing optimized implementation")
     optimized_db = db_manager_optimized.DatabaseManager(optimized_db_path)
     optimized_db.setup_database()
     
-    start_time = time.time()
-    db_manager_optimized.store_data(test_data)
-    optimized_time = time.time() - start_time
+    # Write the baseline under the sanitized column names the database managers
+    # query by, so the query benchmark can read the original database
+    baseline_data = test_data.rename(columns=_sanitize_column_name)
     
-    results['optimized_insert'] = optimized_time
-    logger.info(f"Optimized implementation: {optimized_time:.2f} seconds")
-    
-    # Batch insert (optimized only)
-    logger.info("Testing batch insert")
-    start_time = time.time()
-    db_manager_optimized.batch_store_data(test_data, batch_size=100)
-    batch_time = time.time() - start_time
-    
-    results['batch_insert'] = batch_time
-    logger.info(f"Batch insert: {batch_time:.2f} seconds")
+    measurements = [
+        ('original_insert', partial(_pandas_insert, original_db_path, baseline_data), "Original (pandas to_sql)"),
+        ('optimized_insert', partial(optimized_db.store_data, test_data), "Optimized implementation"),
+        # Batch insert (optimized only)
+        ('batch_insert', partial(optimized_db.batch_store_data, test_data, batch_size=100), "Batch insert"),
+    ]
     
-    return results
+    # Stores are timed once: repeating them would time updates, not inserts
+    return _measure(measurements, {}, repeat=1, warmup=False)
 
 def benchmark_query(original_db_path: Path, optimized_db_path: Path) -> dict:
     """
@@ -124,78 +184,30 @@ def benchmark_query(original_db_path: Path, optimized_db_path: Path) -> dict:
     """
     logger.info("Benchmarking query operations")
     
-    results = {}
-    
     # Setup database managers
     original_db = db_manager.DatabaseManager(original_db_path)
     optimized_db = db_manager_optimized.DatabaseManager(optimized_db_path)
     
-    # Get all data
-    logger.info("Testing get_all_data")
-    
-    start_time = time.time()
-    original_data = db_manager.get_all_data()
-    original_time = time.time() - start_time
-    
-    start_time = time.time()
-    optimized_data = db_manager_optimized.get_all_data()
-    optimized_time = time.time() - start_time
-    
-    results['original_get_all'] = original_time
-    results['optimized_get_all'] = optimized_time
-    
-    logger.info(f"Get all data - Original: {original_time:.2f} seconds, Optimized: {optimized_time:.2f} seconds")
-    
-    # Filtered data
-    logger.info("Testing get_filtered_data")
     filters = {
         'Property Type': 'Multifamily',
         'Market': 'New York'
     }
-    
-    start_time = time.time()
-    original_filtered = db_manager.get_filtered_data(filters)
-    original_time = time.time() - start_time
-    
-    start_time = time.time()
-    optimized_filtered = db_manager_optimized.get_filtered_data(filters)
-    optimized_time = time.time() - start_time
-    
-    results['original_filter'] = original_time
-    results['optimized_filter'] = optimized_time
-    
-    logger.info(f"Filtered data - Original: {original_time:.2f} seconds, Optimized: {optimized_time:.2f} seconds")
-    
-    # Search data
-    logger.info("Testing search_data")
-    
-    start_time = time.time()
-    original_search = db_manager.search_data("New York")
-    original_time = time.time() - start_time
-    
-    start_time = time.time()
-    optimized_search = db_manager_optimized.search_data("New York")
-    optimized_time = time.time() - start_time
-    
-    results['original_search'] = original_time
-    results['optimized_search'] = optimized_time
-    
-    logger.info(f"Search data - Original: {original_time:.2f} seconds, Optimized: {optimized_time:.2f} seconds")
-    
-    # Test aggregated data (optimized only)
-    logger.info("Testing aggregated data")
-    
-    start_time = time.time()
     group_by = ["Property_Type", "Market"]
     metrics = {"Property_Value": "sum", "Acquisition_Price": "avg", "id": "count"}
-    aggregated_data = db_manager_optimized.get_aggregated_data(group_by, metrics)
-    optimized_time = time.time() - start_time
-    
-    results['optimized_aggregate'] = optimized_time
     
-    logger.info(f"Aggregated data - Optimized: {optimized_time:.2f} seconds")
+    measurements = [
+        ('original_get_all', original_db.get_all_data, "Get all data - Original"),
+        ('optimized_get_all', optimized_db.get_all_data, "Get all data - Optimized"),
+        ('original_filter', partial(original_db.get_filtered_data, filters), "Filtered data - Original"),
+        ('optimized_filter', partial(optimized_db.get_filtered_data, filters), "Filtered data - Optimized"),
+        ('original_search', partial(original_db.search_data, "New York"), "Search data - Original"),
+        ('optimized_search', partial(optimized_db.search_data, "New York"), "Search data - Optimized"),
+        # Aggregated data (optimized only)
+        ('optimized_aggregate', partial(optimized_db.get_aggregated_data, group_by, metrics),
+         "Aggregated data - Optimized"),
+    ]
     
-    return results
+    return _measure(measurements, {})
 
 def plot_results(insert_results: dict, query_results: dict, output_path: Path) -> None:
     """
@@ -208,22 +220,24 @@ def plot_results(insert_results: dict, query_results: dict, output_path: Path) -
     """
     logger.info("Plotting benchmark results")
     
+    # Imported here so running the benchmark doesn't pay for matplotlib until
+    # plotting; Agg avoids initializing a GUI backend on headless runs
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    
     # Create output directory if it doesn't exist
     output_path.mkdir(parents=True, exist_ok=True)
     
     # Plot insert results
     plt.figure(figsize=(10, 6))
-    insert_labels = ['Original Insert', 'Optimized Insert', 'Batch Insert']
+    insert_labels = ['Pandas to_sql', 'Optimized Insert', 'Batch Insert']
     insert_values = [insert_results['original_insert'], insert_results['optimized_insert'], insert_results['batch_insert']]
     
     bars = plt.bar(insert_labels, insert_values, color=['#ff9999', '#66b3ff', '#99ff99'])
     
     # Add values on top of bars
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                 f'{height:.2f}s',
-                 ha='center', va='bottom')
+    plt.bar_label(bars, fmt='%.2fs', padding=3)
     
     plt.title('Database Insert Performance Comparison')
     plt.ylabel('Time (seconds)')
@@ -231,7 +245,6 @@ def plot_results(insert_results: dict, query_results: dict, output_path: Path) -
     plt.savefig(output_path / 'insert_benchmark.png')
     
     # Plot query results
-    plt.figure(figsize=(12, 6))
     query_pairs = [
         ('original_get_all', 'optimized_get_all', 'Get All Data'),
         ('original_filter', 'optimized_filter', 'Filtered Data'),
@@ -249,18 +262,9 @@ def plot_results(insert_results: dict, query_results: dict, output_path: Path) -
     rects2 = ax.bar(x + width/2, optimized_values, width, label='Optimized', color='#66b3ff')
     
     # Add values on top of bars
-    for rect in rects1:
-        height = rect.get_height()
-        ax.text(rect.get_x() + rect.get_width()/2., height + 0.1,
-                f'{height:.2f}s',
-                ha='center', va='bottom')
-    
-    for rect in rects2:
-        height = rect.get_height()
-        ax.text(rect.get_x() + rect.get_width()/2., height + 0.1,
-                f'{height:.2f}s',
-                ha='center', va='bottom')
-    
+    ax.bar_label(rects1, fmt='%.2fs', padding=3)
+    ax.bar_label(rects2, fmt='%.2fs', padding=3)
+
     ax.set_ylabel('Time (seconds)')
     ax.set_title('Database Query Performance Comparison')
     ax.set_xticks(x)
@@ -289,11 +293,7 @@ def plot_results(insert_results: dict, query_results: dict, output_path: Path) -
     bars = plt.bar(speedup_labels, speedup_values, color='#66b3ff')
     
     # Add values on top of bars
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                 f'{height:.2f}x',
-                 ha='center', va='bottom')
+    plt.bar_label(bars, fmt='%.2fx', padding=3)
     
     plt.title('Performance Improvement Factor (Higher is Better)')
     plt.ylabel('Speedup Factor (x times faster)')
@@ -333,6 +333,9 @@ def main():
     # Create output directory for plots
     output_path = Path("benchmark/results")
     
+    # Save the raw timings
+    save_results({**insert_results, **query_results}, output_path, "db_benchmark")
+    
     # Plot results
     plot_results(insert_results, query_results, output_path)
     
@@ -340,7 +343,7 @@ def main():
     print("\nBenchmark Results Summary:")
     print("=========================")
     print("\nInsert Operations:")
-    print(f"Original Implementation: {insert_results['original_insert']:.2f} seconds")
+    print(f"Original (pandas to_sql): {insert_results['original_insert']:.2f} seconds")
     print(f"Optimized Implementation: {insert_results['optimized_insert']:.2f} seconds")
     print(f"Batch Insert: {insert_results['batch_insert']:.2f} seconds")
     print(f"Speedup (Original vs. Optimized): {insert_results['original_insert'] / insert_results['optimized_insert']:.2f}x")
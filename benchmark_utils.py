@@ -0,0 +1,59 @@
+"""
+Benchmark Utilities
+
+This module holds the timing and result-saving helpers shared by the
+benchmark scripts.
+"""
+
+import time
+import timeit
+import logging
+from pathlib import Path
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def bench(fn, *args, repeat: int = 5, warmup: bool = True, **kwargs) -> float:
+    """
+    Time a call with a high-resolution clock, taking the best of several runs.
+
+    Args:
+        fn: Function to time
+        *args: Positional arguments for fn
+        repeat: Number of timed runs
+        warmup: Whether to make one untimed call first, to exclude first-call effects
+        **kwargs: Keyword arguments for fn
+
+    Returns:
+        Fastest run time in seconds
+    """
+    if warmup:
+        fn(*args, **kwargs)
+    timer = timeit.Timer(lambda: fn(*args, **kwargs), timer=time.perf_counter_ns)
+    return min(timer.repeat(repeat=repeat, number=1)) / 1e9
+
+def save_results(results: dict, output_path: Path, name: str) -> Path:
+    """
+    Save the raw benchmark timings so they can be analysed without matplotlib.
+
+    Args:
+        results: Dictionary of benchmark timings in seconds
+        output_path: Directory to save the results in
+        name: File name to save the results under, without extension
+
+    Returns:
+        Path of the saved results file
+    """
+    output_path.mkdir(parents=True, exist_ok=True)
+    df = pd.DataFrame(results, index=[0])
+
+    try:
+        results_file = output_path / f"{name}.parquet"
+        df.to_parquet(results_file)
+    except ImportError:
+        # Parquet needs pyarrow or fastparquet
+        results_file = output_path / f"{name}.csv"
+        df.to_csv(results_file, index=False)
+
+    logger.info(f"Raw timings saved to {results_file}")
+    return results_file
@@ -52,8 +52,7 @@ def check_database():
             db_manager.cursor.execute(f"SELECT * FROM {db_manager.table_name} LIMIT 5")
             sample_data = db_manager.cursor.fetchall()
             print("\nSample data (first 5 rows):")
-            for row in sample_data:
-                print(row)
+            print("\n".join(map(str, sample_data)))
         except Exception as e:
             print(f"Error fetching sample data: {str(e)}")
             
@@ -68,8 +67,7 @@ def check_database():
                 db_manager.cursor.execute(f"SELECT * FROM {db_manager.table_name} LIMIT 5")
                 sample_data = db_manager.cursor.fetchall()
                 print("Sample data (first 5 rows):")
-                for row in sample_data:
-                    print(row)
+                print("\n".join(map(str, sample_data)))
             except Exception as inner_e:
                 print(f"Alternative approach also failed: {str(inner_e)}")
             
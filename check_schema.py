@@ -4,6 +4,8 @@ Script to check database schema
 """
 import sqlite3
 import sys
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 
 # Database path
@@ -14,20 +16,26 @@ print(f"Checking database at: {db_path}")
 conn = sqlite3.connect(db_path)
 cursor = conn.cursor()
 
-# Get table names
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-tables = cursor.fetchall()
+# Get every table's columns in one query
+cursor.execute("""
+    SELECT m.name, p.name, p.type
+    FROM sqlite_master m, pragma_table_info(m.name) p
+    WHERE m.type='table'
+    ORDER BY m.rowid, p.cid;
+""")
+schema = {
+    table_name: [(col[1], col[2]) for col in columns]
+    for table_name, columns in groupby(cursor.fetchall(), key=itemgetter(0))
+}
 print("Tables in database:")
-for table in tables:
-    print(f"  - {table[0]}")
+for table_name in schema:
+    print(f"  - {table_name}")
 
-# Get schema for each table
-for table_name in [t[0] for t in tables]:
+# Print schema for each table
+for table_name, columns in schema.items():
     print(f"\nSchema for {table_name}:")
-    cursor.execute(f"PRAGMA table_info({table_name});")
-    columns = cursor.fetchall()
-    for col in columns:
-        print(f"  - {col[1]} ({col[2]})")
+    for col_name, col_type in columns:
+        print(f"  - {col_name} ({col_type})")
 
 # Get sample data from underwriting_model_data
 try:
@@ -35,9 +43,8 @@ try:
     cursor.execute("SELECT * FROM underwriting_model_data LIMIT 3;")
     sample_data = cursor.fetchall()
     if sample_data:
-        # Get column names
-        cursor.execute("PRAGMA table_info(underwriting_model_data);")
-        col_names = [col[1] for col in cursor.fetchall()]
+        # Column names from the schema read above
+        col_names = [col[0] for col in schema.get("underwriting_model_data", [])]
         print(f"Columns: {col_names}")
         
         # Print sample data
@@ -4,13 +4,14 @@ import os
 from pathlib import Path
 
 # Base directories
-PROJECT_ROOT = Path("C:/Users/MattBorgeson/OneDrive - B&R Capital/Programming Projects/Underwriting Dashboard")
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATABASE_DIR = PROJECT_ROOT / "database"
 LOGS_DIR = PROJECT_ROOT / "logs"
 
-# Ensure directories exist
-os.makedirs(DATABASE_DIR, exist_ok=True)
-os.makedirs(LOGS_DIR, exist_ok=True)
+def ensure_dirs():
+    """Create the database and logs directories if they don't exist."""
+    os.makedirs(DATABASE_DIR, exist_ok=True)
+    os.makedirs(LOGS_DIR, exist_ok=True)
 
 # Database settings
 DATABASE_PATH = DATABASE_DIR / "underwriting_models.db"
@@ -28,7 +29,7 @@ DEAL_STAGE_DIRS = [
 ]
 
 # Reference file
-REFERENCE_FILE = PROJECT_ROOT / "Prompt" / "Underwriting Dashboard Project - Cell Value References.xlsx"
+REFERENCE_FILE = PROJECT_ROOT / "prompt" / "Underwriting Dashboard Project - Cell Value References.xlsx"
 REFERENCE_SHEET = "UW Model - Cell Reference Table"
 
 # File criteria
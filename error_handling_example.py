@@ -20,6 +20,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seeded generator, so each run of the example fails in the same places
+_rand = random.Random(0).random
+
 # Import error handling utilities
 from src.utils.error_handler import (
     ApplicationError,
@@ -43,7 +46,7 @@ from src.utils.error_monitor import (
 def example_database_operation():
     """Simulate a database operation that might fail."""
     logger.info("Attempting database operation...")
-    if random.random() < 0.5:
+    if _rand() < 0.5:
         raise Exception("Database connection failed: Connection timeout")
     
     return "Database operation succeeded"
@@ -52,7 +55,7 @@ def example_database_operation():
 @capture_errors(error_type=FileError, default_return=None)
 def example_file_operation(file_path):
     """Simulate a file operation that might fail."""
-    logger.info(f"Attempting to read file: {file_path}")
+    logger.info("Attempting to read file: %s", file_path)
     
     if not Path(file_path).exists():
         raise FileNotFoundError(f"File not found: {file_path}")
@@ -67,7 +70,7 @@ def example_config_operation():
         logger.info("Checking configuration...")
         
         # Simulate a configuration error
-        if random.random() < 0.7:
+        if _rand() < 0.7:
             missing_key = "IMPORTANT_SETTING"
             raise KeyError(f"Missing required configuration: {missing_key}")
         
@@ -86,7 +89,7 @@ def example_config_operation():
         error_registry.register(error)
         
         # Log the error
-        logger.warning(f"Configuration error: {error}")
+        logger.warning("Configuration error: %s", error)
         
         return None
 
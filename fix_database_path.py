@@ -6,6 +6,7 @@ This script updates the database configuration to ensure the dashboard
 can connect to the database file properly in both Windows and WSL environments.
 """
 import os
+import re
 import sys
 from pathlib import Path
 import logging
@@ -19,90 +20,11 @@ logger = logging.getLogger(__name__)
 project_root = Path(__file__).parent
 sys.path.append(str(project_root))
 
-def update_config_settings():
-    """Update the settings.py file to use absolute paths with platform detection."""
-    from src.config.settings import settings
-    
-    # Get the actual database file path
-    db_path = project_root / "database" / "underwriting_models.db"
-    
-    if os.path.exists(db_path):
-        logger.info(f"Found database at: {db_path}")
-        
-        # Create a .env file to override settings
-        env_file = project_root / ".env"
-        
-        # Create reasonable default for deals root if it doesn't exist
-        deals_root = os.path.join(os.path.dirname(project_root), "Deals")
-        
-        with open(env_file, "w") as f:
-            f.write(f"DATABASE_PATH={db_path.absolute()}\n")
-            f.write(f"DEALS_ROOT={deals_root}\n")
-            f.write(f"DEBUG=True\n")
-        
-        logger.info(f"Created .env file with database path at: {env_file}")
-        logger.info(f"Database path set to: {db_path.absolute()}")
-        logger.info(f"Deals root set to: {deals_root}")
-        
-        # Check if deals root exists
-        if not os.path.exists(deals_root):
-            logger.warning(f"Deals root directory does not exist: {deals_root}")
-            logger.warning("You may need to update the DEALS_ROOT environment variable in the .env file")
-        return True
-    else:
-        logger.error(f"Database file not found at: {db_path}")
-        return False
+# DEALS_ROOT setting in the .env file
+DEALS_ROOT_RE = re.compile(r'^DEALS_ROOT=(.*)$', re.MULTILINE)
 
-def check_database_table():
-    """Check if the database table exists and is accessible."""
-    import sqlite3
-    
-    db_path = project_root / "database" / "underwriting_models.db"
-    
-    if not os.path.exists(db_path):
-        logger.error(f"Database file does not exist at: {db_path}")
-        return False
-    
-    try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        
-        # Check if the table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='underwriting_model_data';")
-        result = cursor.fetchone()
-        
-        if result:
-            logger.info("Database table 'underwriting_model_data' exists")
-            
-            # Check row count
-            cursor.execute("SELECT COUNT(*) FROM underwriting_model_data;")
-            count = cursor.fetchone()[0]
-            logger.info(f"Database contains {count} rows of data")
-            
-            # Check column count
-            cursor.execute("PRAGMA table_info(underwriting_model_data);")
-            columns = cursor.fetchall()
-            logger.info(f"Database table has {len(columns)} columns")
-            
-            conn.close()
-            return True
-        else:
-            logger.error("Database table 'underwriting_model_data' does not exist")
-            conn.close()
-            return False
-    except Exception as e:
-        logger.error(f"Error checking database: {str(e)}")
-        return False
-
-def fix_connection_in_db_manager():
-    """Update the database manager to ensure proper connection handling."""
-    # Create fixed database manager 
-    db_manager_path = project_root / "src" / "database" / "db_manager_fixed.py"
-    
-    try:
-        # Create a fixed version that ensures proper path handling
-        with open(db_manager_path, "w") as f:
-            f.write("""#!/usr/bin/env python
+# Source of src/database/db_manager_fixed.py, written by fix_connection_in_db_manager
+DB_MANAGER_FIXED_SOURCE = """#!/usr/bin/env python
 \"\"\"
 Fixed Database Manager
 
@@ -110,51 +32,119 @@ This is a simplified version of the database manager that ensures
 proper connection to the database file in both Windows and WSL environments.
 \"\"\"
 import os
+import atexit
+import queue
 import sqlite3
+import threading
+import time
 import pandas as pd
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
 from pathlib import Path
 from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict, Any, Optional, Tuple, Union
 
+from src.database.sqlite_utils import journal_pragmas
+
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+    ADBC_SUPPORT = True
+except ImportError:
+    ADBC_SUPPORT = False
+
 logger = logging.getLogger(__name__)
 
+class _ParentHandler(logging.Handler):
+    \"\"\"Pass records on to the parent loggers' handlers\"\"\"
+    
+    def emit(self, record):
+        logger.parent.handle(record)
+
+# Log through a queue so slow log files (e.g. on a WSL or network mount) are written
+# from a background thread rather than on every database call. Records are handed
+# to whatever handlers the application has configured by the time they're written.
+_log_queue = queue.SimpleQueue()
+logger.addHandler(QueueHandler(_log_queue))
+logger.propagate = False
+_log_listener = QueueListener(_log_queue, _ParentHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 # CRITICAL FIX: Get the absolute path to the database file
 PROJECT_ROOT = Path(__file__).absolute().parents[2]
 DEFAULT_DB_PATH = PROJECT_ROOT / "database" / "underwriting_models.db"
 DATABASE_PATH = os.environ.get("DATABASE_PATH", str(DEFAULT_DB_PATH))
 
+# Applied to every new connection, after the journal mode from journal_pragmas
+CONNECTION_PRAGMAS = \"\"\"
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+    PRAGMA temp_store=MEMORY;
+\"\"\"
+
+# One shared DatabaseManager per thread, so the module-level functions reuse
+# a connection instead of reconnecting on every call
+_pool = threading.local()
+
+# Short-lived cache of query results, so dashboard re-renders with unchanged
+# filters don't re-read the table
+QUERY_CACHE_SIZE = 32
+QUERY_CACHE_TTL = 30  # seconds
+_query_cache = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+# SQL text for each shape of filtered query. Reusing identical text lets sqlite3's
+# per-connection statement cache skip re-parsing and re-planning
+STATEMENT_CACHE_SIZE = 64
+_statement_cache = OrderedDict()
+_statement_cache_lock = threading.Lock()
+
+# Columns get_all_data leaves out by default. Metadata holds each file's JSON blob,
+# which the dashboard doesn't render
+HIDDEN_COLUMNS = frozenset({"Metadata"})
+
+# Rows per chunk when reading the whole table without ADBC
+READ_CHUNK_SIZE = 10000
+
 class DatabaseManager:
     \"\"\"Database manager with connection handling and query methods\"\"\"
     
-    def __init__(self, db_path=None):
-        \"\"\"Initialize the database manager\"\"\"
+    def __init__(self, db_path=None, pooled=False):
+        \"\"\"Initialize the database manager; pooled managers stay connected on disconnect()\"\"\"
         self.db_path = db_path or DATABASE_PATH
+        self.pooled = pooled
         self.conn = None
         self.cursor = None
         self.table_name = "underwriting_model_data"
         self._column_cache = None
+        self._schema_version = None
+        self._display_column_mapping = None
+        self._visible_columns = None
         self.connect()
     
     def connect(self):
         \"\"\"Connect to the database\"\"\"
         try:
             # Print the path to help debug
-            logger.info(f"Connecting to database: {self.db_path}")
+            logger.debug(f"Connecting to database: {self.db_path}")
             
             # Make sure the path exists
-            db_dir = os.path.dirname(self.db_path)
-            if not os.path.exists(db_dir):
-                os.makedirs(db_dir, exist_ok=True)
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
             
-            # Connect to the database
-            self.conn = sqlite3.connect(self.db_path)
+            # Connect to the database. Autocommit mode, so reads aren't wrapped in
+            # implicit transactions; anything that writes must BEGIN/COMMIT itself
+            self.conn = sqlite3.connect(self.db_path, isolation_level=None, cached_statements=256)
             self.cursor = self.conn.cursor()
             
-            # Enable WAL mode for better concurrency
-            self.cursor.execute("PRAGMA journal_mode=WAL;")
+            # Enable WAL mode for better concurrency where the file system supports it,
+            # and read through a memory map and a 64 MiB page cache
+            for pragma in journal_pragmas(self.db_path):
+                self.cursor.execute(pragma)
+            self.cursor.executescript(CONNECTION_PRAGMAS)
             
-            logger.info(f"Connected to database: {self.db_path}")
+            logger.debug(f"Connected to database: {self.db_path}")
             return True
         except Exception as e:
             logger.error(f"Error connecting to database: {str(e)}")
@@ -164,6 +154,13 @@ class DatabaseManager:
     
     def disconnect(self):
         \"\"\"Disconnect from the database\"\"\"
+        if self.pooled:
+            # Shared connections are closed by close_pool()
+            return
+        self.close()
+    
+    def close(self):
+        \"\"\"Close the connection, even if it is pooled\"\"\"
         if self.cursor:
             self.cursor.close()
             self.cursor = None
@@ -174,11 +171,20 @@ class DatabaseManager:
             self.conn = None
             logger.info("Database connection closed")
     
+    def invalidate_cache(self):
+        \"\"\"Drop cached columns and query results; call after writing to the database\"\"\"
+        self._clear_column_caches()
+        invalidate_cache()
+    
+    def _clear_column_caches(self):
+        \"\"\"Drop the cached column lists, so they're re-read on next use\"\"\"
+        self._column_cache = None
+        self._schema_version = None
+        self._display_column_mapping = None
+        self._visible_columns = None
+    
     def _get_columns(self) -> List[str]:
-        \"\"\"Get the column names from the database\"\"\"
-        if self._column_cache:
-            return self._column_cache
-        
+        \"\"\"Get the column names from the database, re-reading them whenever the schema changed\"\"\"
         try:
             if self.conn is None or self.cursor is None:
                 self.connect()
@@ -187,15 +193,55 @@ class DatabaseManager:
                 logger.error("Failed to establish a database cursor")
                 return []
             
+            # schema_version changes whenever any connection alters the schema, e.g. an
+            # ingest in another process adding columns
+            self.cursor.execute("PRAGMA schema_version;")
+            schema_version = self.cursor.fetchone()[0]
+            if self._column_cache and schema_version == self._schema_version:
+                return self._column_cache
+            self._clear_column_caches()
+            
             # Get the column names
             self.cursor.execute(f"PRAGMA table_info({self.table_name});")
             columns = [col[1] for col in self.cursor.fetchall()]
             self._column_cache = columns
+            self._schema_version = schema_version
             return columns
         except Exception as e:
             logger.error(f"Error getting columns: {str(e)}")
             return []
     
+    def _get_visible_columns(self):
+        \"\"\"Get the table columns the dashboard shows, rebuilt when the schema changes\"\"\"
+        columns = self._get_columns()
+        if not columns:
+            # Table not there yet; try again next call
+            return []
+        if self._visible_columns is None:
+            self._visible_columns = [col for col in columns if col not in HIDDEN_COLUMNS]
+        return self._visible_columns
+    
+    def _get_display_column_mapping(self):
+        \"\"\"Get the mapping from database column names to dashboard names, rebuilt when the schema changes\"\"\"
+        columns = self._get_columns()
+        if not columns:
+            # Table not there yet; try again next call
+            return {}
+        if self._display_column_mapping is None:
+            self._display_column_mapping = {col: col.replace('_', ' ') for col in columns if '_' in col}
+        return self._display_column_mapping
+    
+    def _get_fts_columns(self):
+        \"\"\"Get the columns covered by db_manager's trigram search index, or [] if there is none\"\"\"
+        fts_table = f"{self.table_name}_fts"
+        self.cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (fts_table,))
+        row = self.cursor.fetchone()
+        if not row or 'trigram' not in row[0]:
+            # Older token-based indexes don't match substrings the way LIKE does
+            return []
+        self.cursor.execute(f"PRAGMA table_info({fts_table});")
+        return [col[1] for col in self.cursor.fetchall()]
+    
     def execute_query(self, query, params=None):
         \"\"\"Execute a SQL query\"\"\"
         try:
@@ -213,8 +259,15 @@ class DatabaseManager:
             logger.error(f"Error executing query: {str(e)}")
             return []
     
-    def get_all_data(self):
-        \"\"\"Get all data from the database\"\"\"
+    def _read_arrow(self, query):
+        \"\"\"Run a query through the ADBC SQLite driver, which returns Arrow columns instead of Python rows\"\"\"
+        with adbc_sqlite.connect(str(self.db_path)) as conn, conn.cursor() as cursor:
+            cursor.execute(query)
+            table = cursor.fetch_arrow_table()
+        return table.to_pandas(self_destruct=True)
+    
+    def get_all_data(self, columns=None):
+        \"\"\"Get all rows from the database; columns defaults to every column the dashboard shows\"\"\"
         try:
             if self.conn is None:
                 self.connect()
@@ -225,88 +278,179 @@ class DatabaseManager:
                 logger.error(f"Table {self.table_name} does not exist")
                 return pd.DataFrame()
             
-            # Get all data
-            query = f"SELECT * FROM {self.table_name}"
-            df = pd.read_sql_query(query, self.conn)
+            # Get all data, leaving out wide columns the dashboard doesn't show
+            if columns is None:
+                columns = self._get_visible_columns()
+            query = f"SELECT {', '.join(columns) if columns else '*'} FROM {self.table_name}"
+            df = None
+            if ADBC_SUPPORT:
+                try:
+                    df = self._read_arrow(query)
+                except Exception as e:
+                    logger.warning(f"Arrow read failed, falling back to sqlite3: {str(e)}")
+            
+            if df is None:
+                # Read in chunks to cap the memory held in Python row objects at once
+                df = pd.concat(pd.read_sql_query(query, self.conn, chunksize=READ_CHUNK_SIZE), ignore_index=True)
             
             # Convert column names with underscores to spaces for dashboard
-            column_mapping = {col: col.replace('_', ' ') for col in df.columns if '_' in col}
-            df = df.rename(columns=column_mapping)
+            df.rename(columns=self._get_display_column_mapping(), inplace=True)
             
             return df
         except Exception as e:
             logger.error(f"Error getting all data: {str(e)}")
             return pd.DataFrame()
     
-    def get_filtered_data(self, filters=None, search_term=None):
-        \"\"\"Get filtered data from the database\"\"\"
+    def get_filtered_data(self, filters=None, search_term=None, limit=None, offset=0):
+        \"\"\"Get filtered data from the database, optionally only one page of it\"\"\"
         try:
             if self.conn is None:
                 self.connect()
             
-            # Start with base query
-            query = f"SELECT * FROM {self.table_name}"
-            params = []
+            # Search through the trigram FTS5 index that db_manager maintains, when it
+            # exists and the term is long enough for it to match
+            fts_columns = self._get_fts_columns() if search_term and len(search_term) >= 3 else []
             
-            # Add filters
-            if filters:
-                # Convert filters with spaces to underscores
-                db_filters = {}
-                for key, value in filters.items():
-                    db_key = key.replace(' ', '_')
-                    db_filters[db_key] = value
-                
-                # Build WHERE clause
-                where_clauses = []
-                for key, value in db_filters.items():
-                    where_clauses.append(f"{key} = ?")
-                    params.append(value)
-                
-                if where_clauses:
-                    query += " WHERE " + " AND ".join(where_clauses)
+            # Convert filters with spaces to underscores, in a fixed order so the
+            # same filtered columns always produce the same SQL
+            db_filters = sorted(((key.replace(' ', '_'), value) for key, value in (filters or {}).items()),
+                                key=itemgetter(0))
+            params = [value for _, value in db_filters]
             
             # Add search term
-            if search_term:
-                columns = self._get_columns()
-                search_clauses = []
-                
-                for col in columns:
-                    search_clauses.append(f"{col} LIKE ?")
-                    params.append(f"%{search_term}%")
-                
-                if search_clauses:
-                    if "WHERE" in query:
-                        query += " AND (" + " OR ".join(search_clauses) + ")"
-                    else:
-                        query += " WHERE " + " OR ".join(search_clauses)
+            if fts_columns:
+                search_mode = "fts"
+                # Quote the term so FTS5 query syntax in user input is matched literally
+                params.append('"' + search_term.replace('"', '""') + '"')
+                # Columns the index doesn't cover (e.g. numeric ones) are still scanned with LIKE
+                indexed = set(fts_columns)
+                columns = tuple(col for col in self._get_columns() if col not in indexed)
+                params.extend([f"%{search_term}%"] * len(columns))
+            elif search_term:
+                # No usable FTS5 index (or a term too short for it), so scan every column with LIKE
+                search_mode = "like"
+                columns = tuple(self._get_columns())
+                params.extend([f"%{search_term}%"] * len(columns))
+            else:
+                search_mode = None
+                columns = ()
+            
+            if limit is not None:
+                params.extend([limit, offset])
+            
+            shape = (self.table_name, tuple(key for key, _ in db_filters), search_mode, columns, limit is not None)
+            query = _get_filtered_query(shape)
             
             # Execute query
             df = pd.read_sql_query(query, self.conn, params=params)
             
             # Convert column names with underscores to spaces for dashboard
-            column_mapping = {col: col.replace('_', ' ') for col in df.columns if '_' in col}
-            df = df.rename(columns=column_mapping)
+            df.rename(columns=self._get_display_column_mapping(), inplace=True)
             
-            logger.info(f"Retrieved {len(df)} filtered rows from database")
+            logger.debug(f"Retrieved {len(df)} filtered rows from database")
             return df
         except Exception as e:
             logger.error(f"Error getting filtered data: {str(e)}")
             return pd.DataFrame()
 
+def _build_filtered_query(shape):
+    \"\"\"Build the SQL for a filtered query from its shape\"\"\"
+    table_name, filter_keys, search_mode, columns, paged = shape
+    fts_table = f"{table_name}_fts"
+    
+    # Start with base query
+    query = f"SELECT * FROM {table_name} t"
+    
+    # Build WHERE clause
+    where_clauses = [f"t.{key} = ?" for key in filter_keys]
+    if search_mode == "fts":
+        search_clauses = [f"t.rowid IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)"]
+        search_clauses.extend(f"t.{col} LIKE ?" for col in columns)
+        where_clauses.append("(" + " OR ".join(search_clauses) + ")")
+    elif search_mode == "like" and columns:
+        where_clauses.append("(" + " OR ".join(f"t.{col} LIKE ?" for col in columns) + ")")
+    
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    
+    # Page in SQL, ordered by rowid so pages are stable
+    if paged:
+        query += " ORDER BY t.rowid LIMIT ? OFFSET ?"
+    
+    return query
+
+def _get_filtered_query(shape):
+    \"\"\"Get the SQL for a filtered query shape, building it on first use\"\"\"
+    with _statement_cache_lock:
+        query = _statement_cache.get(shape)
+        if query is not None:
+            _statement_cache.move_to_end(shape)
+            return query
+        
+        query = _build_filtered_query(shape)
+        _statement_cache[shape] = query
+        if len(_statement_cache) > STATEMENT_CACHE_SIZE:
+            _statement_cache.popitem(last=False)
+        return query
+
+def _shared_db():
+    \"\"\"Get this thread's shared database manager, connecting on first use\"\"\"
+    db = getattr(_pool, "db", None)
+    if db is None or db.conn is None:
+        db = DatabaseManager(pooled=True)
+        _pool.db = db
+    return db
+
+def close_pool():
+    \"\"\"Close this thread's shared connection, e.g. on shutdown\"\"\"
+    db = getattr(_pool, "db", None)
+    if db is not None:
+        db.close()
+        _pool.db = None
+
+def invalidate_cache():
+    \"\"\"Drop all cached query results, and this thread's shared manager's cached columns\"\"\"
+    with _query_cache_lock:
+        _query_cache.clear()
+    db = getattr(_pool, "db", None)
+    if db is not None:
+        db._clear_column_caches()
+
+def _cached_query(key, load):
+    \"\"\"Return a copy of the cached DataFrame for key, loading it on a miss or after the TTL\"\"\"
+    now = time.monotonic()
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        if entry is not None and now - entry[0] < QUERY_CACHE_TTL:
+            _query_cache.move_to_end(key)
+            return entry[1].copy()
+    
+    df = load()
+    if df.empty:
+        # Don't cache failures or a missing table
+        return df
+    
+    with _query_cache_lock:
+        _query_cache[key] = (now, df)
+        _query_cache.move_to_end(key)
+        while len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return df.copy()
+
 # Functions to use directly
 def get_all_data():
     \"\"\"Get all data from the database\"\"\"
-    db = DatabaseManager()
-    data = db.get_all_data()
-    db.disconnect()
-    return data
+    return _cached_query(("all",), lambda: _shared_db().get_all_data())
 
 def get_filtered_data(filters=None, search_term=None):
     \"\"\"Get filtered data from the database\"\"\"
-    db = DatabaseManager()
-    data = db.get_filtered_data(filters, search_term)
-    db.disconnect()
-    return data
+    key = ("filtered", tuple(sorted(filters.items())) if filters else (), search_term)
+    try:
+        hash(key)
+    except TypeError:
+        # Unhashable filter values (e.g. lists) aren't cached
+        return _shared_db().get_filtered_data(filters, search_term)
+    return _cached_query(key, lambda: _shared_db().get_filtered_data(filters, search_term))
 
 def search_data(search_term):
     \"\"\"Search data in the database\"\"\"
@@ -314,9 +458,7 @@ def search_data(search_term):
 
 def get_aggregated_data(group_by, metrics):
     \"\"\"Get aggregated data from the database\"\"\"
-    db = DatabaseManager()
-    data = db.get_all_data()
-    db.disconnect()
+    data = _shared_db().get_all_data()
     
     # Convert column names for grouping
     group_cols = [col.replace(' ', '_') for col in group_by]
@@ -327,16 +469,93 @@ def get_aggregated_data(group_by, metrics):
 
 def get_data_paginated(page=1, page_size=100, filters=None, search_term=None):
     \"\"\"Get paginated data from the database\"\"\"
-    db = DatabaseManager()
-    data = db.get_filtered_data(filters, search_term)
-    db.disconnect()
+    return _shared_db().get_filtered_data(filters, search_term, limit=page_size, offset=(page - 1) * page_size)
+"""
+
+def update_config_settings():
+    """Update the settings.py file to use absolute paths with platform detection."""
+    from src.config.settings import settings
+    
+    # Get the actual database file path
+    db_path = project_root / "database" / "underwriting_models.db"
+    
+    if os.path.exists(db_path):
+        logger.info(f"Found database at: {db_path}")
+        
+        # Create a .env file to override settings
+        env_file = project_root / ".env"
+        
+        # Create reasonable default for deals root if it doesn't exist
+        deals_root = os.path.join(os.path.dirname(project_root), "Deals")
+        
+        env_file.write_text(
+            f"DATABASE_PATH={db_path.absolute()}\n"
+            f"DEALS_ROOT={deals_root}\n"
+            "DEBUG=True\n"
+        )
+        
+        logger.info(f"Created .env file with database path at: {env_file}")
+        logger.info(f"Database path set to: {db_path.absolute()}")
+        logger.info(f"Deals root set to: {deals_root}")
+        
+        # Check if deals root exists
+        if not Path(deals_root).is_dir():
+            logger.warning(f"Deals root directory does not exist: {deals_root}")
+            logger.warning("You may need to update the DEALS_ROOT environment variable in the .env file")
+        return True
+    else:
+        logger.error(f"Database file not found at: {db_path}")
+        return False
+
+def check_database_table():
+    """Check if the database table exists and is accessible."""
+    import sqlite3
     
-    # Calculate pagination
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
+    db_path = project_root / "database" / "underwriting_models.db"
+    
+    if not os.path.exists(db_path):
+        logger.error(f"Database file does not exist at: {db_path}")
+        return False
+    
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        
+        # Check if the table exists
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='underwriting_model_data';")
+        result = cursor.fetchone()
+        
+        if result:
+            logger.info("Database table 'underwriting_model_data' exists")
+            
+            # Check row count
+            cursor.execute("SELECT COUNT(*) FROM underwriting_model_data;")
+            count = cursor.fetchone()[0]
+            logger.info(f"Database contains {count} rows of data")
+            
+            # Check column count
+            cursor.execute("PRAGMA table_info(underwriting_model_data);")
+            columns = cursor.fetchall()
+            logger.info(f"Database table has {len(columns)} columns")
+            
+            conn.close()
+            return True
+        else:
+            logger.error("Database table 'underwriting_model_data' does not exist")
+            conn.close()
+            return False
+    except Exception as e:
+        logger.error(f"Error checking database: {str(e)}")
+        return False
+
+def fix_connection_in_db_manager():
+    """Update the database manager to ensure proper connection handling."""
+    # Create fixed database manager 
+    db_manager_path = project_root / "src" / "database" / "db_manager_fixed.py"
     
-    return data.iloc[start_idx:end_idx]
-""")
+    try:
+        # Create a fixed version that ensures proper path handling
+        db_manager_path.write_text(DB_MANAGER_FIXED_SOURCE)
         logger.info(f"Created fixed database manager at: {db_manager_path}")
         
         # Now update the dashboard service to use the fixed version
@@ -373,12 +592,8 @@ def create_mock_deal_structure():
     try:
         # Read the .env file to get the deals root
         env_file = project_root / ".env"
-        deals_root = None
-        
-        with open(env_file, "r") as f:
-            for line in f:
-                if line.startswith("DEALS_ROOT="):
-                    deals_root = line.strip().split("=", 1)[1]
+        match = DEALS_ROOT_RE.search(env_file.read_text())
+        deals_root = match.group(1).strip() if match else None
         
         if not deals_root:
             logger.error("DEALS_ROOT not found in .env file")
@@ -386,7 +601,7 @@ def create_mock_deal_structure():
         
         # Create the deal stage directories
         deals_path = Path(deals_root)
-        os.makedirs(deals_path, exist_ok=True)
+        deals_path.mkdir(parents=True, exist_ok=True)
         
         deal_stages = [
             "0) Dead Deals",
@@ -399,7 +614,7 @@ def create_mock_deal_structure():
         
         for stage in deal_stages:
             stage_path = deals_path / stage
-            os.makedirs(stage_path, exist_ok=True)
+            stage_path.mkdir(exist_ok=True)
             logger.info(f"Created deal stage directory: {stage_path}")
         
         return True
@@ -7,9 +7,81 @@ they can be run directly with streamlit.
 """
 
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
+# Marks a file that already has the import fix
+FIX_MARKER = b"# --- Import Fix for Streamlit ---"
+
+# Optional shebang line, then an optional module docstring up to the end of its closing line
+HEADER_RE = re.compile(r'\A(?:#![^\n]*\n)?(?:\s*(?P<quote>"""|\'\'\').*?(?P=quote)[ \t]*\n)?', re.DOTALL)
+
+# Import fix to add at the top of each file
+IMPORT_FIX = """
+# --- Import Fix for Streamlit ---
+import sys
+import os
+from pathlib import Path
+
+# Add the project root to the Python path
+project_root = str(Path(__file__).resolve().parents[{parent_level}])
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+# ---------------------------
+"""
+
+@lru_cache(maxsize=None)
+def _import_fix_for(parent_level):
+    """
+    Format the import fix for files a given number of directories below the project root.
+    
+    Args:
+        parent_level: Number of directories between the file and the project root
+        
+    Returns:
+        Import fix text
+    """
+    return IMPORT_FIX.format(parent_level=parent_level)
+
+def _fix_one(file_path, project_root):
+    """
+    Add the import fix to one file.
+    
+    Args:
+        file_path: File to fix
+        project_root: Project root directory
+        
+    Returns:
+        Progress messages for the file, printed by the caller so output stays in order
+    """
+    if not file_path.exists():
+        return [f"Skipping {file_path.name}: File not found"]
+    
+    messages = [f"Fixing imports in {file_path.name}..."]
+    
+    # Determine parent level (how many directories up to reach project root)
+    parent_level = len(file_path.parents) - len(project_root.parents) - 1
+    current_fix = _import_fix_for(parent_level)
+    
+    # Check for the fix marker before decoding the file
+    raw = file_path.read_bytes()
+    if FIX_MARKER in raw:
+        messages.append(f"  Already fixed, skipping")
+        return messages
+    # Normalize line endings as text-mode reading would; write_text translates them back
+    content = raw.decode('utf-8').replace('\r\n', '\n')
+    
+    # Insert the import fix after the shebang and module docstring, if present
+    header = HEADER_RE.match(content)
+    insert_pos = header.end() if header else 0
+    file_path.write_text(content[:insert_pos] + current_fix + '\n' + content[insert_pos:], encoding='utf-8')
+    
+    messages.append(f"  Fixed imports in {file_path.name}")
+    return messages
+
 def fix_imports():
     """
     Adds import fixes to Python files to ensure they work with Streamlit.
@@ -29,71 +101,10 @@ def fix_imports():
         project_root / "src" / "dashboard" / "utils" / "responsive.py"
     ]
     
-    # Import fix to add at the top of each file
-    import_fix = """
-# --- Import Fix for Streamlit ---
-import sys
-import os
-from pathlib import Path
-
-# Add the project root to the Python path
-project_root = str(Path(__file__).resolve().parents[{parent_level}])
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-# ---------------------------
-"""
-    
-    # Fix each file
-    for file_path in dashboard_files:
-        if not file_path.exists():
-            print(f"Skipping {file_path.name}: File not found")
-            continue
-        
-        print(f"Fixing imports in {file_path.name}...")
-        
-        # Determine parent level (how many directories up to reach project root)
-        parent_level = len(file_path.relative_to(project_root).parts) - 1
-        current_fix = import_fix.format(parent_level=parent_level)
-        
-        # Read file content
-        with open(file_path, 'r') as f:
-            content = f.read()
-        
-        # Skip if file already has the fix
-        if "# --- Import Fix for Streamlit ---" in content:
-            print(f"  Already fixed, skipping")
-            continue
-        
-        # Find position to insert import fix (after docstring if present)
-        lines = content.split('\n')
-        insert_pos = 0
-        
-        # Skip shebang if present
-        if lines and lines[0].startswith('#!'):
-            insert_pos = 1
-        
-        # Skip docstring if present
-        in_docstring = False
-        for i, line in enumerate(lines[insert_pos:], insert_pos):
-            if line.strip().startswith('"""') or line.strip().startswith("'''"):
-                if not in_docstring:
-                    in_docstring = True
-                else:
-                    in_docstring = False
-                    insert_pos = i + 1
-                    break
-            elif not line.strip() and not in_docstring:
-                # Skip blank lines before docstring
-                insert_pos = i
-        
-        # Insert import fix
-        lines.insert(insert_pos, current_fix)
-        
-        # Write updated content
-        with open(file_path, 'w') as f:
-            f.write('\n'.join(lines))
-        
-        print(f"  Fixed imports in {file_path.name}")
+    # Fix the files concurrently; each one is a small read and write
+    with ThreadPoolExecutor(max_workers=min(8, len(dashboard_files))) as executor:
+        for messages in executor.map(partial(_fix_one, project_root=project_root), dashboard_files):
+            print("\n".join(messages))
     
     print("\nAll imports fixed. You can now run the dashboard with:")
     print("  streamlit run src/dashboard/app.py")
@@ -2,6 +2,7 @@
 """
 Fix indentation in the settings.py file
 """
+import re
 import sys
 import os
 from pathlib import Path
@@ -12,6 +13,12 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# The _get_list_env signature on a line that isn't indented as a class method
+GET_LIST_ENV_RE = re.compile(
+    r"^(?!    def )[ \t]*(" + re.escape("def _get_list_env(self, env_var: str, default: List[str]) -> List[str]:") + r")[ \t]*$",
+    re.MULTILINE
+)
+
 def fix_indentation():
     """Fix indentation in the settings.py file."""
     project_root = Path(__file__).parent
@@ -24,21 +31,17 @@ def fix_indentation():
     logger.info(f"Fixing indentation in settings file at: {settings_path}")
     
     try:
-        with open(settings_path, "r") as f:
-            lines = f.readlines()
+        content = settings_path.read_text()
+        
+        # Re-indent the _get_list_env method as a class method
+        fixed_content = GET_LIST_ENV_RE.sub(r"    \1", content)
         
-        # Find the indentation issue with _get_list_env
-        fixed_lines = []
-        for line in lines:
-            # Fix the indentation for the _get_list_env method
-            if "def _get_list_env(self, env_var: str, default: List[str]) -> List[str]:" in line and not line.startswith("    def "):
-                fixed_lines.append("    def _get_list_env(self, env_var: str, default: List[str]) -> List[str]:\n")
-            else:
-                fixed_lines.append(line)
+        if fixed_content == content:
+            logger.info("No indentation change needed in settings.py")
+            return True
         
         # Write the fixed content
-        with open(settings_path, "w") as f:
-            f.writelines(fixed_lines)
+        settings_path.write_text(fixed_content)
         
         logger.info("Successfully fixed indentation in settings.py")
         return True
@@ -2,6 +2,7 @@
 """
 Quick fix for the settings.py file to make DEALS_ROOT optional
 """
+import ast
 import sys
 import os
 from pathlib import Path
@@ -12,35 +13,8 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def update_settings_file():
-    """Update the settings.py file to make DEALS_ROOT optional."""
-    project_root = Path(__file__).parent
-    settings_path = project_root / "src" / "config" / "settings.py"
-    
-    if not os.path.exists(settings_path):
-        logger.error(f"Settings file not found at: {settings_path}")
-        return False
-    
-    logger.info(f"Updating settings file at: {settings_path}")
-    
-    try:
-        with open(settings_path, "r") as f:
-            content = f.read()
-        
-        # Replace the method that checks DEALS_ROOT
-        if "def _path_from_env(self, env_var: str, default: Optional[Path] = None) -> Path:" in content:
-            # Find the start of the method
-            method_start = content.find("def _path_from_env(self, env_var: str, default: Optional[Path] = None) -> Path:")
-            # Find the end of the method (next def or end of class)
-            next_def = content.find("def ", method_start + 1)
-            if next_def == -1:
-                next_def = len(content)
-            
-            # Extract the method content
-            method_content = content[method_start:next_def]
-            
-            # Create the new method content
-            new_method_content = '''def _path_from_env(self, env_var: str, default: Optional[Path] = None) -> Path:
+# Replacement _path_from_env method, indented for the Settings class
+PATH_FROM_ENV_SOURCE = '''    def _path_from_env(self, env_var: str, default: Optional[Path] = None) -> Path:
         """Get a path from an environment variable, with an optional default."""
         path_str = os.getenv(env_var)
         if path_str:
@@ -55,19 +29,45 @@ def update_settings_file():
         
         raise ValueError(f"Required path environment variable {env_var} not set")
 '''
-            
-            # Replace the method
-            new_content = content.replace(method_content, new_method_content)
-            
-            # Write the updated content
-            with open(settings_path, "w") as f:
-                f.write(new_content)
-            
-            logger.info("Successfully updated settings.py to make DEALS_ROOT optional")
+
+def update_settings_file():
+    """Update the settings.py file to make DEALS_ROOT optional."""
+    project_root = Path(__file__).parent
+    settings_path = project_root / "src" / "config" / "settings.py"
+    
+    if not os.path.exists(settings_path):
+        logger.error(f"Settings file not found at: {settings_path}")
+        return False
+    
+    logger.info(f"Updating settings file at: {settings_path}")
+    
+    try:
+        content = settings_path.read_text()
+        
+        # Nothing to do if the file already has the fix
+        if "Special case for DEALS_ROOT" in content:
+            logger.info("settings.py already makes DEALS_ROOT optional")
             return True
-        else:
+        
+        # Find the method through the syntax tree, so formatting changes don't break the match
+        tree = ast.parse(content)
+        method = next(
+            (node
+             for class_node in tree.body if isinstance(class_node, ast.ClassDef) and class_node.name == "Settings"
+             for node in class_node.body if isinstance(node, ast.FunctionDef) and node.name == "_path_from_env"),
+            None
+        )
+        if method is None:
             logger.error("Could not find _path_from_env method in settings.py")
             return False
+        
+        # Replace just the method's lines, keeping the rest of the file (and its comments) as is
+        lines = content.splitlines(keepends=True)
+        new_content = "".join(lines[:method.lineno - 1]) + PATH_FROM_ENV_SOURCE + "".join(lines[method.end_lineno:])
+        settings_path.write_text(new_content)
+        
+        logger.info("Successfully updated settings.py to make DEALS_ROOT optional")
+        return True
     except Exception as e:
         logger.error(f"Error updating settings.py: {str(e)}")
         return False
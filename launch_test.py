@@ -12,7 +12,6 @@ sys.path.insert(0, str(project_root))
 
 # Import to verify component loading
 print("Testing imports...")
-import pandas as pd
 from src.services.dashboard_service import DashboardService
 from src.config.settings import settings
 from src.dashboard.utils.data_processing import process_data_for_display, get_key_metrics
@@ -25,16 +25,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Import services once logging is configured, since some modules log on import
+from src.database.db_manager import setup_database
+from src.services.file_service import FileService
+from src.services.monitoring_service import monitoring_service
+
 def main():
     """Initialize and run the underwriting dashboard application."""
     try:
         logger.info("Starting Underwriting Dashboard application")
         
-        # Import services
-        from src.database.db_manager import setup_database
-        from src.services.file_service import FileService
-        from src.services.monitoring_service import monitoring_service
-        
         # Initial setup
         logger.info("Setting up database")
         setup_database()
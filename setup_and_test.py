@@ -120,7 +120,6 @@ def test_basic_functionality():
     try:
         # Import key modules for testing
         from src.config.settings import settings
-        from src.services.file_service import FileService
         from src.database.db_manager import get_all_data
         
         # Check if we can get data from the database
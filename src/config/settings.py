@@ -7,13 +7,10 @@ load settings from environment variables and config files.
 
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
 import json
 import logging
-from dotenv import load_dotenv
-
-# Load environment variables from .env file if present
-load_dotenv()
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +24,10 @@ class Settings:
         self.database_dir = self._path_from_env("DATABASE_DIR", self.project_root / "database")
         self.logs_dir = self._path_from_env("LOGS_DIR", self.project_root / "logs")
         
-        # Ensure directories exist
-        os.makedirs(self.database_dir, exist_ok=True)
-        os.makedirs(self.logs_dir, exist_ok=True)
+        # Ensure directories exist; usually they do, so check with a single stat
+        for directory in (self.database_dir, self.logs_dir):
+            if not directory.exists():
+                directory.mkdir(parents=True, exist_ok=True)
         
         # Database settings
         self.database_path = self._path_from_env("DATABASE_PATH", self.database_dir / "underwriting_models.db")
@@ -90,26 +88,26 @@ class Settings:
             return [item.strip() for item in list_str.split(",")]
         return default
     
-    def _get_deal_stage_dirs(self) -> List[Path]:
+    def _get_deal_stage_dirs(self) -> Tuple[Path, ...]:
         """Get the deal stage directories."""
         # Try environment variable for deal stage directories
         env_stages = os.getenv("DEAL_STAGE_DIRS")
         if env_stages:
-            return [Path(dir_path.strip()) for dir_path in env_stages.split(",")]
+            return tuple(Path(dir_path.strip()) for dir_path in env_stages.split(","))
         
         # If deals_root is specified, use default subdirectories
         if self.deals_root:
-            return [
+            return (
                 self.deals_root / "0) Dead Deals",
                 self.deals_root / "1) Initial UW and Review",
                 self.deals_root / "2) Active UW and Review",
                 self.deals_root / "3) Deals Under Contract",
                 self.deals_root / "4) Closed Deals",
                 self.deals_root / "5) Realized Deals"
-            ]
+            )
         
         # No defaults available
-        return []
+        return ()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert settings to a dictionary for serialization."""
@@ -117,7 +115,7 @@ class Settings:
         for key, value in self.__dict__.items():
             if isinstance(value, Path):
                 result[key] = str(value)
-            elif isinstance(value, list) and all(isinstance(item, Path) for item in value):
+            elif isinstance(value, (list, tuple)) and all(isinstance(item, Path) for item in value):
                 result[key] = [str(item) for item in value]
             else:
                 result[key] = value
@@ -128,5 +126,36 @@ class Settings:
         with open(file_path, "w") as f:
             json.dump(self.to_dict(), f, indent=2)
 
-# Create a global settings instance
-settings = Settings()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings, reading the environment on first use only.
+    
+    Returns:
+        Shared Settings instance
+    """
+    # Load environment variables from .env file if present, unless this or a
+    # parent process already loaded it (child processes inherit the loaded
+    # variables). Imported here so processes that never read settings don't pay
+    # for importing dotenv
+    if not os.environ.get("SETTINGS_ENV_LOADED"):
+        from dotenv import load_dotenv
+        load_dotenv()
+        os.environ["SETTINGS_ENV_LOADED"] = "1"
+    
+    return Settings()
+
+def __getattr__(name: str) -> Any:
+    """
+    Build the global settings instance on first access (PEP 562), so importing
+    this module doesn't read the environment or create directories.
+    
+    Args:
+        name: Module attribute being looked up
+        
+    Returns:
+        The shared Settings instance for 'settings'
+    """
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
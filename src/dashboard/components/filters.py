@@ -22,12 +22,6 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from src.config.settings import settings
-import sys
-from pathlib import Path
-
-# Add project root to path for imports
-project_root = str(Path(__file__).resolve().parents[3])
-sys.path.append(project_root)
 
 from src.database.db_manager_optimized import get_column_values, DatabaseManager
 
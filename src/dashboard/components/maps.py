@@ -9,6 +9,7 @@ This module provides the map visualization functionality for the Underwriting Da
 # --- Import Fix for Streamlit ---
 import sys
 import os
+import re
 from pathlib import Path
 
 # Add the project root to the Python path
@@ -21,344 +22,449 @@ if project_root not in sys.path:
 import streamlit as st
 import pandas as pd
 import folium
-from streamlit_folium import folium_static
-import sys
-from pathlib import Path
+from folium.plugins import FastMarkerCluster
+import streamlit.components.v1 as components
 import numpy as np
 
-# Add project root to path for imports
-project_root = str(Path(__file__).resolve().parents[3])
-sys.path.append(project_root)
+# Above this many points a layer is rendered as a client-side cluster instead of
+# individual markers
+MAX_MAP_MARKERS = 5000
 
-def render_property_map(data):
-    """Render a map visualization of the properties and rent comps."""
-    st.subheader("Property Map")
+# Column-name patterns, matched against lower-cased column names
+_LNG_RE = re.compile(r'lon|lng')
+_COMP_RE = re.compile(r'comp')  # Also covers "comparable"
+_COMP_NUM_RE = re.compile(r'comp ?(\d+)')
+
+# Deal stage to marker color mapping
+STAGE_COLORS = {
+    "0) Dead Deals": "gray",
+    "1) Initial UW and Review": "blue",
+    "2) Active UW and Review": "orange",
+    "3) Deals Under Contract": "purple",
+    "4) Closed Deals": "green",
+    "5) Realized Deals": "red"
+}
+
+# The legend is static apart from the rent comps section, so build it once at import
+_LEGEND_MAIN = '''
+<div style="position: fixed; 
+            bottom: 50px; left: 50px; width: 220px; 
+            border:2px solid grey; z-index:9999; font-size:14px;
+            background-color:white; padding: 8px;
+            opacity: 0.8;">
+<p style="margin-bottom: 5px; font-weight: bold;">Map Legend</p>
+<p style="margin-bottom: 3px; margin-top: 8px;"><b>Main Properties</b></p>
+''' + ''.join(
+    f'''
+    <div style="display: flex; align-items: center; margin-bottom: 5px;">
+        <div style="background-color: {color}; width: 20px; height: 20px; margin-right: 5px;"></div>
+        <span>{stage}</span>
+    </div>
+    '''
+    for stage, color in STAGE_COLORS.items()
+)
+
+_LEGEND_COMPS = '''
+<p style="margin-bottom: 3px; margin-top: 8px;"><b>Rent Comps</b></p>
+<div style="display: flex; align-items: center; margin-bottom: 5px;">
+    <div style="background-color: green; width: 20px; height: 20px; margin-right: 5px;"></div>
+    <span>Rent Comparables</span>
+</div>
+'''
+
+_LEGEND_TAIL = '</div>'
+
+# Marker styles are CSS classes defined once in the map header, so each marker
+# only carries a class name instead of its own icon options
+_STAGE_CLASSES = {stage: f"uw-stage-{i}" for i, stage in enumerate(STAGE_COLORS)}
+_OTHER_STAGE_CLASS = "uw-stage-other"
+_COMP_CLASS = "uw-comp"
+
+_MARKER_CSS = '''
+<style>
+.uw-marker {
+    border: 2px solid white; border-radius: 50%;
+    box-shadow: 0 1px 3px rgba(0, 0, 0, 0.5);
+    color: white; font-size: 12px; line-height: 20px; text-align: center;
+}
+''' + ''.join(
+    f'.{css_class} {{ background-color: {STAGE_COLORS[stage]}; }}\n'
+    for stage, css_class in _STAGE_CLASSES.items()
+) + f'''.{_OTHER_STAGE_CLASS} {{ background-color: blue; }}
+.{_COMP_CLASS} {{ background-color: green; }}
+</style>
+'''
+
+def _marker_icon(css_class, glyph):
+    """Build a marker icon styled by one of the CSS classes in _MARKER_CSS."""
+    return folium.DivIcon(
+        html=f'<i class="fa fa-{glyph}"></i>',
+        icon_size=(24, 24),
+        icon_anchor=(12, 12),
+        class_name=f"uw-marker {css_class}",
+    )
+
+def _add_marker_cluster(m, lat, lng, name):
+    """Add points to the map as one client-side clustered layer.
     
-    # Check for the presence of data
-    if data.empty:
-        st.info("No data available to display on the map.")
-        return
+    Used instead of individual markers once a layer exceeds MAX_MAP_MARKERS, so the
+    HTML size and Leaflet DOM stay bounded. Clustered points carry no popups.
+    """
+    FastMarkerCluster(np.column_stack((lat, lng)).tolist(), name=name).add_to(m)
+
+def _valid_coordinate_mask(lat, lng):
+    """Return a boolean mask of rows holding plausible, non-placeholder coordinates.
+
+    Both inputs are float64 arrays (NaN for unparseable values); the checks are
+    evaluated column-wise so no per-row Python branching is needed.
+    """
+    return (
+        ~np.isnan(lat) & ~np.isnan(lng) &
+        (np.abs(lat) >= 0.001) & (np.abs(lng) >= 0.001) &
+        (lat >= -90) & (lat <= 90) &
+        (lng >= -180) & (lng <= 180)
+    )
+
+def _build_property_map(data, show_rent_comps):
+    """Build the folium map for the given data.
     
-    # Add toggle for showing rent comps
-    if 'show_rent_comps' not in st.session_state:
-        st.session_state['show_rent_comps'] = True  # Default to showing rent comps
-        
-    show_rent_comps = st.checkbox("Show Rent Comps on Map", 
-                                value=st.session_state['show_rent_comps'],
-                                help="Toggle to show or hide rent comparable properties on the map")
+    Returns:
+        Tuple of (map, main properties added, rent comps added), or None if the
+        data has no usable location columns
+    """
+    # Lower-case every column name once; all pattern checks below reuse these
+    cols_lower = {col: str(col).lower() for col in data.columns}
     
-    # Update session state when toggle changes
-    if show_rent_comps != st.session_state['show_rent_comps']:
-        st.session_state['show_rent_comps'] = show_rent_comps
+    # PART 1 & 2: CLASSIFY COORDINATE COLUMNS IN A SINGLE PASS
+    # Main property coordinates avoid comp/comparable in the name; rent comp
+    # coordinates are only collected if the toggle is on
+    main_lat_col = None
+    main_lng_col = None
+    rent_comp_lat_cols = []
+    rent_comp_lng_cols = []
     
-    try:
-        # PART 1: FIND MAIN PROPERTY COORDINATES
-        main_lat_col = None
-        main_lng_col = None
+    for col, col_lower in cols_lower.items():
+        is_lat = 'lat' in col_lower
+        is_lng = _LNG_RE.search(col_lower) is not None
+        if not (is_lat or is_lng):
+            continue
         
-        # Find main property coordinates - more flexible patterns
-        for col in data.columns:
-            col_str = str(col).lower()
-            
-            # Look for primary property latitude (avoiding comp/comparable in the name)
-            if (('lat' in col_str) and 
-                ('comp' not in col_str) and 
-                ('comparable' not in col_str) and 
-                main_lat_col is None):
-                main_lat_col = col
-                
-            # Look for primary property longitude
-            if (('lon' in col_str or 'lng' in col_str) and 
-                ('comp' not in col_str) and 
-                ('comparable' not in col_str) and 
-                main_lng_col is None):
-                main_lng_col = col
-        
-        # PART 2: FIND RENT COMP COORDINATES - only if toggle is on
-        rent_comp_lat_cols = []
-        rent_comp_lng_cols = []
-        
-        if show_rent_comps:
-            # Look for any columns that might be rent comp coordinates
-            for col in data.columns:
-                col_str = str(col).lower()
-                
-                # Match rent comp latitude columns with more flexible patterns
-                if (('lat' in col_str) and 
-                    (('comp' in col_str) or ('comparable' in col_str))):
+        if _COMP_RE.search(col_lower):
+            if show_rent_comps:
+                if is_lat:
                     rent_comp_lat_cols.append(col)
-                    
-                # Match rent comp longitude columns
-                if ((('lon' in col_str) or ('lng' in col_str)) and 
-                    (('comp' in col_str) or ('comparable' in col_str))):
+                if is_lng:
                     rent_comp_lng_cols.append(col)
+        else:
+            if is_lat and main_lat_col is None:
+                main_lat_col = col
+            if is_lng and main_lng_col is None:
+                main_lng_col = col
+    
+    # Check if we have the necessary data
+    if (main_lat_col is None or main_lng_col is None) and (not rent_comp_lat_cols or not rent_comp_lng_cols):
+        return None
+    
+    # The map only reads from the data, so no defensive copy is needed
+    map_data = data
+    
+    # PART 3: PREPARE THE MAP
+    # Calculate center for the map (using main property if available)
+    center_lat = None
+    center_lng = None
+    
+    # Try to get center from main property
+    if main_lat_col is not None and main_lng_col is not None:
+        try:
+            valid_coords = pd.to_numeric(map_data[main_lat_col], errors='coerce').notna() & \
+                           pd.to_numeric(map_data[main_lng_col], errors='coerce').notna()
+                          
+            if valid_coords.any():
+                center_lat = pd.to_numeric(map_data.loc[valid_coords, main_lat_col]).mean()
+                center_lng = pd.to_numeric(map_data.loc[valid_coords, main_lng_col]).mean()
+        except Exception as e:
+            st.warning(f"Error calculating map center: {str(e)}")
+    
+    # Default center if we couldn't determine from data
+    if center_lat is None or center_lng is None:
+        center_lat = 37.0902  # Default to somewhere in the US
+        center_lng = -95.7129
+    
+    # Create the map
+    m = folium.Map(location=[center_lat, center_lng], zoom_start=5)
+    m.get_root().header.add_child(folium.Element(_MARKER_CSS))
+    
+    # PART 4: ADD MAIN PROPERTIES TO MAP
+    main_properties_added = 0
+    property_col = None
+    
+    if main_lat_col is not None and main_lng_col is not None:
+        # Get property name column
+        for col, col_lower in cols_lower.items():
+            if (('name' in col_lower) and 
+                (('property' in col_lower) or ('deal' in col_lower)) and
+                ('comp' not in col_lower)):
+                property_col = col
+                break
         
-        # Check if we have the necessary data
-        if (main_lat_col is None or main_lng_col is None) and (not rent_comp_lat_cols or not rent_comp_lng_cols):
-            st.warning("No location data found in the dataset. Unable to render map.")
-            st.write("Try selecting columns with latitude/longitude data.")
-            return
-        
-        # Create a copy for mapping to avoid modifying the original
-        map_data = data.copy()
-        
-        # PART 3: PREPARE THE MAP
-        # Calculate center for the map (using main property if available)
-        center_lat = None
-        center_lng = None
-        
-        # Try to get center from main property
-        if main_lat_col is not None and main_lng_col is not None:
-            try:
-                valid_coords = pd.to_numeric(map_data[main_lat_col], errors='coerce').notna() & \
-                               pd.to_numeric(map_data[main_lng_col], errors='coerce').notna()
-                              
-                if valid_coords.any():
-                    center_lat = pd.to_numeric(map_data.loc[valid_coords, main_lat_col]).mean()
-                    center_lng = pd.to_numeric(map_data.loc[valid_coords, main_lng_col]).mean()
-            except Exception as e:
-                st.warning(f"Error calculating map center: {str(e)}")
+        if property_col is None:
+            # Fallback to first column if no property name is found
+            property_col = map_data.columns[0]
         
-        # Default center if we couldn't determine from data
-        if center_lat is None or center_lng is None:
-            center_lat = 37.0902  # Default to somewhere in the US
-            center_lng = -95.7129
+        # Resolve the City/State/Address popup columns once instead of per row
+        detail_cols = []
+        for field in ['City', 'State', 'Address']:
+            field_lower = field.lower()
+            for col, col_lower in cols_lower.items():
+                if field_lower in col_lower and 'comp' not in col_lower:
+                    detail_cols.append((field, col))
+                    break
         
-        # Create the map
-        m = folium.Map(location=[center_lat, center_lng], zoom_start=5)
+        # Convert coordinates once and keep only rows with valid values
+        lat_values = pd.to_numeric(map_data[main_lat_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        lng_values = pd.to_numeric(map_data[main_lng_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        valid_rows = np.flatnonzero(_valid_coordinate_mask(lat_values, lng_values))
         
-        # PART 4: ADD MAIN PROPERTIES TO MAP
-        main_properties_added = 0
+        # Pull the popup/tooltip columns out as arrays once; the loop indexes these
+        # instead of boxing a pandas Series per row
+        property_names = map_data[property_col].to_numpy()
+        stages = None
+        if 'Deal_Stage_Subdirectory_Name' in map_data.columns:
+            stages = map_data['Deal_Stage_Subdirectory_Name'].to_numpy()
+        detail_values = [(field, map_data[col].to_numpy()) for field, col in detail_cols]
         
-        if main_lat_col is not None and main_lng_col is not None:
-            # Deal stage to color mapping
-            stage_colors = {
-                "0) Dead Deals": "gray",
-                "1) Initial UW and Review": "blue",
-                "2) Active UW and Review": "orange", 
-                "3) Deals Under Contract": "purple",
-                "4) Closed Deals": "green",
-                "5) Realized Deals": "red"
-            }
+        if len(valid_rows) > MAX_MAP_MARKERS:
+            # Too many properties for individual markers - cluster each stage client-side
+            if stages is not None:
+                layer_names = np.array([stage if stage in STAGE_COLORS else "Other Deals" for stage in stages[valid_rows]])
+            else:
+                layer_names = np.full(len(valid_rows), "Other Deals")
             
-            # Get property name column
-            property_col = None
-            for col in map_data.columns:
-                col_str = str(col).lower()
-                if (('name' in col_str) and 
-                    (('property' in col_str) or ('deal' in col_str)) and
-                    ('comp' not in col_str)):
-                    property_col = col
-                    break
-            
-            if property_col is None:
-                # Fallback to first column if no property name is found
-                property_col = map_data.columns[0]
+            for layer_name in np.unique(layer_names):
+                rows = valid_rows[layer_names == layer_name]
+                _add_marker_cluster(m, lat_values[rows], lng_values[rows], str(layer_name))
             
+            main_properties_added = len(valid_rows)
+        else:
+            # One layer per deal stage so stages can be toggled in the browser
+            stage_groups = {}
+        
             # Process rows with valid coordinates
-            for idx, row in map_data.iterrows():
+            for pos in valid_rows:
                 try:
-                    # Extract and convert coordinates
-                    lat_val = pd.to_numeric(row[main_lat_col], errors='coerce')
-                    lng_val = pd.to_numeric(row[main_lng_col], errors='coerce')
-                    
-                    # Skip invalid coordinates
-                    if pd.isna(lat_val) or pd.isna(lng_val) or abs(lat_val) < 0.001 or abs(lng_val) < 0.001:
-                        continue
-                    
-                    # Check coordinate validity (use broader range to be safe)
-                    if lat_val < -90 or lat_val > 90 or lng_val < -180 or lng_val > 180:
-                        continue
-                    
+                    lat_val = lat_values[pos]
+                    lng_val = lng_values[pos]
+                
                     # Get deal stage for color
-                    color = "blue"  # Default color
-                    if 'Deal_Stage_Subdirectory_Name' in row:
-                        stage = row['Deal_Stage_Subdirectory_Name']
-                        if stage in stage_colors:
-                            color = stage_colors[stage]
-                    
+                    css_class = _OTHER_STAGE_CLASS  # Default color
+                    layer_name = "Other Deals"
+                    if stages is not None:
+                        stage = stages[pos]
+                        if stage in _STAGE_CLASSES:
+                            css_class = _STAGE_CLASSES[stage]
+                            layer_name = stage
+                
                     # Create popup content
                     popup_content = f"<strong>Main Property</strong><br>"
-                    
-                    # Add property name if available
-                    if property_col in row:
-                        popup_content += f"<strong>{row[property_col]}</strong><br>"
-                    
+                
+                    # Add property name
+                    popup_content += f"<strong>{property_names[pos]}</strong><br>"
+                
                     # Add city/state if available
-                    for field in ['City', 'State', 'Address']:
-                        for col in map_data.columns:
-                            if field.lower() in str(col).lower() and 'comp' not in str(col).lower():
-                                popup_content += f"{field}: {row[col]}<br>"
-                                break
-                    
+                    for field, values in detail_values:
+                        popup_content += f"{field}: {values[pos]}<br>"
+                
                     # Add coordinates
                     popup_content += f"Latitude: {lat_val}<br>"
                     popup_content += f"Longitude: {lng_val}<br>"
-                    
+                
                     # Add deal stage if available
-                    if 'Deal_Stage_Subdirectory_Name' in row:
-                        popup_content += f"Stage: {row['Deal_Stage_Subdirectory_Name']}<br>"
-                    
-                    # Add marker
+                    if stages is not None:
+                        popup_content += f"Stage: {stages[pos]}<br>"
+                
+                    # Add marker to its stage layer
+                    stage_group = stage_groups.get(layer_name)
+                    if stage_group is None:
+                        stage_group = folium.FeatureGroup(name=layer_name, show=True)
+                        stage_groups[layer_name] = stage_group
+                
                     folium.Marker(
                         location=[float(lat_val), float(lng_val)],
                         popup=folium.Popup(popup_content, max_width=300),
-                        tooltip=str(row[property_col]) if property_col in row else "Main Property",
-                        icon=folium.Icon(color=color, icon="home")
-                    ).add_to(m)
-                    
+                        tooltip=str(property_names[pos]),
+                        icon=_marker_icon(css_class, "home")
+                    ).add_to(stage_group)
+                
                     main_properties_added += 1
                 except Exception as e:
                     continue  # Skip this property if there's an error
         
-        # PART 5: ADD RENT COMPS TO MAP - Only if toggle is on
-        rent_comps_added = 0
+            for stage_group in stage_groups.values():
+                stage_group.add_to(m)
+    
+    # PART 5: ADD RENT COMPS TO MAP - Only if toggle is on
+    rent_comps_added = 0
+    
+    if show_rent_comps:
+        # Pair lat/lng columns that might belong together
+        coord_pairs = []
         
-        if show_rent_comps:
-            # Pair lat/lng columns that might belong together
-            coord_pairs = []
-            
-            # First try to match by numeric pattern (e.g., "comp 1", "comp 2")
-            for lat_col in rent_comp_lat_cols:
-                lat_col_lower = str(lat_col).lower()
+        # First try to match by numeric pattern (e.g., "comp 1", "comp 2")
+        lng_cols_by_num = {}
+        for lng_col in rent_comp_lng_cols:
+            num_match = _COMP_NUM_RE.search(cols_lower[lng_col])
+            if num_match:
+                lng_cols_by_num.setdefault(int(num_match.group(1)), lng_col)
+        
+        for lat_col in rent_comp_lat_cols:
+            num_match = _COMP_NUM_RE.search(cols_lower[lat_col])
+            if num_match:
+                comp_num = int(num_match.group(1))
+                if comp_num in lng_cols_by_num:
+                    coord_pairs.append((lat_col, lng_cols_by_num[comp_num], f"Rent Comp {comp_num}", comp_num))
+        
+        # For any unmatched columns, try simple pattern matching
+        used_lat_cols = [pair[0] for pair in coord_pairs]
+        used_lng_cols = [pair[1] for pair in coord_pairs]
+        
+        for lat_col in rent_comp_lat_cols:
+            if lat_col in used_lat_cols:
+                continue
                 
-                # Try to find matching number pattern
-                for lng_col in rent_comp_lng_cols:
-                    lng_col_lower = str(lng_col).lower()
-                    
-                    # Check if both columns have the same comp number
-                    matched = False
-                    for i in range(1, 21):  # Up to 20 comps
-                        if (f"comp {i}" in lat_col_lower or f"comp{i}" in lat_col_lower) and \
-                           (f"comp {i}" in lng_col_lower or f"comp{i}" in lng_col_lower):
-                            comp_num = i
-                            coord_pairs.append((lat_col, lng_col, f"Rent Comp {i}", comp_num))
-                            matched = True
-                            break
-                    
-                    if matched:
-                        break
-            
-            # For any unmatched columns, try simple pattern matching
-            used_lat_cols = [pair[0] for pair in coord_pairs]
-            used_lng_cols = [pair[1] for pair in coord_pairs]
+            lat_col_base = cols_lower[lat_col].replace('latitude', '').replace('lat', '')
             
-            for lat_col in rent_comp_lat_cols:
-                if lat_col in used_lat_cols:
+            for lng_col in rent_comp_lng_cols:
+                if lng_col in used_lng_cols:
                     continue
                     
-                lat_col_base = str(lat_col).lower().replace('latitude', '').replace('lat', '')
+                lng_col_base = cols_lower[lng_col].replace('longitude', '').replace('long', '').replace('lng', '')
                 
-                for lng_col in rent_comp_lng_cols:
-                    if lng_col in used_lng_cols:
-                        continue
-                        
-                    lng_col_base = str(lng_col).lower().replace('longitude', '').replace('long', '').replace('lng', '')
-                    
-                    # If the base parts match, pair them
-                    if lat_col_base.strip() == lng_col_base.strip():
-                        # Use -1 as a placeholder for unumbered comps
-                        coord_pairs.append((lat_col, lng_col, f"Rent Comp", -1))
-                        used_lat_cols.append(lat_col)
-                        used_lng_cols.append(lng_col)
-                        break
+                # If the base parts match, pair them
+                if lat_col_base.strip() == lng_col_base.strip():
+                    # Use -1 as a placeholder for unumbered comps
+                    coord_pairs.append((lat_col, lng_col, f"Rent Comp", -1))
+                    used_lat_cols.append(lat_col)
+                    used_lng_cols.append(lng_col)
+                    break
+        
+        # Look up the name and rent columns for each comp number once, rather than
+        # scanning every column for every row
+        comp_coord_cols = set(rent_comp_lat_cols) | set(rent_comp_lng_cols)
+        comp_name_cols = {}
+        comp_rent_cols = {}
+        for col, col_lower in cols_lower.items():
+            if col in comp_coord_cols:
+                continue
+            num_match = _COMP_NUM_RE.search(col_lower)
+            if num_match is None:
+                continue
+            comp_num = int(num_match.group(1))
+            # Name patterns like "Rent Comp 1 Name" or "Comp 1 Property"
+            if 'name' in col_lower or 'property' in col_lower:
+                comp_name_cols.setdefault(comp_num, []).append(col)
+            if 'rent' in col_lower or 'price' in col_lower:
+                comp_rent_cols.setdefault(comp_num, []).append(col)
+        
+        # Resolve each pair's coordinates, valid rows and lookup columns up front
+        pair_points = []
+        for lat_col, lng_col, name, comp_num in coord_pairs:
+            # Placeholders such as "-" coerce to NaN and zeros are masked out
+            lat_values = pd.to_numeric(map_data[lat_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            lng_values = pd.to_numeric(map_data[lng_col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            valid_rows = np.flatnonzero(_valid_coordinate_mask(lat_values, lng_values))
+            
+            # Name columns sharing the base parts of the latitude column, used when
+            # no dedicated name column exists for this comp number
+            lat_col_parts = [part.lower() for part in str(lat_col).split() if len(part) > 2]
+            base_name_cols = [
+                col for col, col_lower in cols_lower.items()
+                if col not in comp_coord_cols and
+                ('name' in col_lower or 'property' in col_lower) and
+                all(part in col_lower for part in lat_col_parts)
+            ]
+            
+            pair_points.append((
+                name, comp_num, lat_values, lng_values, valid_rows,
+                [map_data[col].to_numpy() for col in comp_name_cols.get(comp_num, [])],
+                [map_data[col].to_numpy() for col in base_name_cols],
+                [map_data[col].to_numpy() for col in comp_rent_cols.get(comp_num, [])]
+            ))
+        
+        total_comp_points = sum(len(rows) for _, _, _, _, rows, *_ in pair_points)
+        
+        if total_comp_points > MAX_MAP_MARKERS:
+            # Too many comps for individual markers - cluster them client-side
+            _add_marker_cluster(
+                m,
+                np.concatenate([lat_values[rows] for _, _, lat_values, _, rows, *_ in pair_points]),
+                np.concatenate([lng_values[rows] for _, _, _, lng_values, rows, *_ in pair_points]),
+                "Rent Comps"
+            )
+            rent_comps_added = total_comp_points
+        else:
+            # Rent comps share a single layer that can be hidden client-side
+            comps_group = folium.FeatureGroup(name="Rent Comps", show=True)
             
             # Process each coordinate pair
-            for idx, row in map_data.iterrows():
-                for lat_col, lng_col, name, comp_num in coord_pairs:
+            # Main property names, for the "Referenced by" line
+            referencing_names = map_data[property_col].to_numpy() if property_col is not None else None
+            
+            for (name, comp_num, lat_values, lng_values, valid_rows,
+                 name_values, base_name_values, rent_values) in pair_points:
+                for pos in valid_rows:
                     try:
-                        # Extract and convert coordinates
-                        lat_val = pd.to_numeric(row[lat_col], errors='coerce')
-                        lng_val = pd.to_numeric(row[lng_col], errors='coerce')
-                        
-                        # Skip invalid coordinates
-                        if pd.isna(lat_val) or pd.isna(lng_val):
-                            continue
-                        
-                        # Special handling for weird data patterns like dashes
-                        if isinstance(row[lat_col], str) and '-' in row[lat_col] and len(row[lat_col].strip()) <= 1:
-                            continue
+                        lat_val = lat_values[pos]
+                        lng_val = lng_values[pos]
                         
-                        if isinstance(row[lng_col], str) and '-' in row[lng_col] and len(row[lng_col].strip()) <= 1:
-                            continue
-                        
-                        # Skip obvious zeros or very small values (likely placeholders)
-                        if abs(lat_val) < 0.001 or abs(lng_val) < 0.001:
-                            continue
-                        
-                        # Check coordinate validity
-                        if lat_val < -90 or lat_val > 90 or lng_val < -180 or lng_val > 180:
-                            continue
-                            
                         # IMPROVED PROPERTY NAME DETECTION FOR RENT COMPS
-                        # Look for a name column specifically for this comp number
+                        # Prefer a dedicated name column for this comp number
                         comp_name = None
+                        for values in name_values:
+                            if values[pos] and not pd.isna(values[pos]):
+                                comp_name = values[pos]
+                                break
                         
-                        # First try to find a dedicated name column for this comp
-                        if comp_num > 0:  # If we have a numbered comp
-                            for col in map_data.columns:
-                                col_lower = str(col).lower()
-                                # Look for name patterns like "Rent Comp 1 Name" or "Comp 1 Property"
-                                if (('name' in col_lower or 'property' in col_lower) and 
-                                   (f'comp {comp_num}' in col_lower or f'comp{comp_num}' in col_lower)):
-                                    if row[col] and not pd.isna(row[col]):
-                                        comp_name = row[col]
-                                        break
-                        
-                        # If no name found by number, try to find by column base name
+                        # If no name found by number, fall back to columns sharing the base name
                         if comp_name is None:
-                            lat_col_parts = str(lat_col).split()
-                            for col in map_data.columns:
-                                col_lower = str(col).lower()
-                                # Look for column with similar base name that includes "name"
-                                if ('name' in col_lower or 'property' in col_lower):
-                                    # Check for overlapping base parts
-                                    match = True
-                                    for part in lat_col_parts:
-                                        if len(part) > 2 and part.lower() not in col_lower:
-                                            match = False
-                                            break
-                                    if match and not pd.isna(row[col]):
-                                        comp_name = row[col]
-                                        break
-                        
+                            for values in base_name_values:
+                                if not pd.isna(values[pos]):
+                                    comp_name = values[pos]
+                                    break
+                    
                         # Create popup content
                         popup_content = f"<strong>{name}</strong><br>"
-                        
+                    
                         # Add comp name if found
                         if comp_name:
                             popup_content += f"<strong>Property: {comp_name}</strong><br>"
-                        
+                    
                         # Add main property reference
-                        if property_col in row:
-                            popup_content += f"Referenced by: {row[property_col]}<br>"
-                        
+                        if referencing_names is not None:
+                            popup_content += f"Referenced by: {referencing_names[pos]}<br>"
+                    
                         # Add coordinates
                         popup_content += f"Latitude: {lat_val}<br>"
                         popup_content += f"Longitude: {lng_val}<br>"
-                        
+                    
                         # Add rent information if available
-                        for col in map_data.columns:
-                            col_lower = str(col).lower()
-                            if (('rent' in col_lower or 'price' in col_lower) and
-                                (comp_num > 0 and (f'comp {comp_num}' in col_lower or f'comp{comp_num}' in col_lower))):
-                                if not pd.isna(row[col]):
-                                    popup_content += f"Rent: {row[col]}<br>"
-                                    break
-                        
+                        for values in rent_values:
+                            if not pd.isna(values[pos]):
+                                popup_content += f"Rent: {values[pos]}<br>"
+                                break
+                    
                         # Determine tooltip (popup title)
                         tooltip = name
                         if comp_name:
                             tooltip = f"{name}: {comp_name}"
-                        
+                    
                         # Add marker
                         folium.Marker(
                             location=[float(lat_val), float(lng_val)],
                             popup=folium.Popup(popup_content, max_width=300),
                             tooltip=tooltip,
-                            icon=folium.Icon(color="green", icon="building", prefix="fa")
-                        ).add_to(m)
-                        
+                            icon=_marker_icon(_COMP_CLASS, "building")
+                        ).add_to(comps_group)
+                    
                         # Add a circle to make it more visible
                         folium.CircleMarker(
                             location=[float(lat_val), float(lng_val)],
@@ -367,47 +473,79 @@ def render_property_map(data):
                             fill=True,
                             fill_color="green",
                             fill_opacity=0.2
-                        ).add_to(m)
-                        
+                        ).add_to(comps_group)
+                    
                         rent_comps_added += 1
                     except Exception as e:
                         continue  # Skip this comp if there's an error
+            
+            comps_group.add_to(m)
+    
+    # PART 6: CREATE THE LEGEND
+    # Add a legend to the map
+    legend_html = _LEGEND_MAIN + (_LEGEND_COMPS if show_rent_comps else '') + _LEGEND_TAIL
+    m.get_root().html.add_child(folium.Element(legend_html))
+    
+    # Layer control lets users hide stages or comps without a Streamlit rerun
+    folium.LayerControl(collapsed=False).add_to(m)
+    
+    return m, main_properties_added, rent_comps_added
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _render_map_html(fingerprint, show_rent_comps, _data):
+    """Build the map and render it to a standalone HTML document.
+    
+    Only ``fingerprint`` and ``show_rent_comps`` form the cache key; ``_data`` is
+    passed through unhashed so reruns with unchanged data skip the folium build
+    and serialization entirely.
+    """
+    result = _build_property_map(_data, show_rent_comps)
+    if result is None:
+        return None
+    
+    m, main_properties_added, rent_comps_added = result
+    return m.get_root().render(), main_properties_added, rent_comps_added
+
+def _data_fingerprint(data):
+    """Return a cheap content fingerprint of a DataFrame for use as a cache key."""
+    try:
+        row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    except TypeError:
+        # Unhashable cell values (e.g. lists) - fall back to their string form
+        row_hashes = pd.util.hash_pandas_object(data.astype(str), index=True).to_numpy()
+    return tuple(str(col) for col in data.columns), len(data), int(row_hashes.sum())
+
+def render_property_map(data):
+    """Render a map visualization of the properties and rent comps."""
+    st.subheader("Property Map")
+    
+    # Check for the presence of data
+    if data.empty:
+        st.info("No data available to display on the map.")
+        return
+    
+    # Add toggle for showing rent comps
+    if 'show_rent_comps' not in st.session_state:
+        st.session_state['show_rent_comps'] = True  # Default to showing rent comps
         
-        # PART 6: CREATE THE LEGEND
-        # Add a legend to the map
-        legend_html = '''
-        <div style="position: fixed; 
-                    bottom: 50px; left: 50px; width: 220px; 
-                    border:2px solid grey; z-index:9999; font-size:14px;
-                    background-color:white; padding: 8px;
-                    opacity: 0.8;">
-        <p style="margin-bottom: 5px; font-weight: bold;">Map Legend</p>
-        '''
-        
-        # Main properties legend section
-        legend_html += '<p style="margin-bottom: 3px; margin-top: 8px;"><b>Main Properties</b></p>'
-        
-        for stage, color in stage_colors.items():
-            legend_html += f'''
-            <div style="display: flex; align-items: center; margin-bottom: 5px;">
-                <div style="background-color: {color}; width: 20px; height: 20px; margin-right: 5px;"></div>
-                <span>{stage}</span>
-            </div>
-            '''
-        
-        # Rent comps legend section - only if showing rent comps
-        if show_rent_comps:
-            legend_html += '''
-            <p style="margin-bottom: 3px; margin-top: 8px;"><b>Rent Comps</b></p>
-            <div style="display: flex; align-items: center; margin-bottom: 5px;">
-                <div style="background-color: green; width: 20px; height: 20px; margin-right: 5px;"></div>
-                <span>Rent Comparables</span>
-            </div>
-            '''
+    show_rent_comps = st.checkbox("Show Rent Comps on Map", 
+                                value=st.session_state['show_rent_comps'],
+                                help="Include rent comparable properties in the map. Once included, "
+                                     "individual layers can be toggled from the map's layer control.")
+    
+    # Update session state when toggle changes
+    if show_rent_comps != st.session_state['show_rent_comps']:
+        st.session_state['show_rent_comps'] = show_rent_comps
+    
+    try:
+        rendered = _render_map_html(_data_fingerprint(data), show_rent_comps, data)
         
-        legend_html += '</div>'
+        if rendered is None:
+            st.warning("No location data found in the dataset. Unable to render map.")
+            st.write("Try selecting columns with latitude/longitude data.")
+            return
         
-        m.get_root().html.add_child(folium.Element(legend_html))
+        map_html, main_properties_added, rent_comps_added = rendered
         
         # PART 7: DISPLAY THE MAP
         if main_properties_added == 0 and rent_comps_added == 0:
@@ -420,8 +558,8 @@ def render_property_map(data):
         else:
             st.write(f"Map shows {main_properties_added} main properties (rent comps hidden)")
             
-        folium_static(m, width=800, height=600)
+        components.html(map_html, width=800, height=600)
         
     except Exception as e:
         st.error(f"Error rendering map: {str(e)}")
-        st.write("Try adjusting your filters to include properties with valid coordinates.")
\ No newline at end of file
+        st.write("Try adjusting your filters to include properties with valid coordinates.")
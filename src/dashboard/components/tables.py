@@ -20,12 +20,34 @@ if project_root not in sys.path:
 
 import streamlit as st
 import pandas as pd
-import sys
-from pathlib import Path
 
-# Add project root to path for imports
-project_root = str(Path(__file__).resolve().parents[3])
-sys.path.append(project_root)
+def _prepare_display_data(data, selected_columns):
+    """Project, sanitize and rename the selected columns for display.
+    
+    Projection happens first so the type conversion only touches the columns (and
+    rows) that are actually shown, instead of copying and converting the full frame.
+    
+    Args:
+        data: DataFrame (or page slice) containing the data to display
+        selected_columns: Columns to keep, in display order
+        
+    Returns:
+        DataFrame with readable column names
+    """
+    display_data = data[selected_columns]
+    
+    # Handle coordinate columns that might contain non-numeric values
+    coord_columns = [
+        col for col in selected_columns
+        if 'lat' in str(col).lower() or 'lon' in str(col).lower() or 'lng' in str(col).lower()
+    ]
+    if coord_columns:
+        # Convert to string to prevent conversion errors
+        display_data = display_data.astype({col: str for col in coord_columns})
+    
+    # Create a clean display version with better column names
+    display_data.columns = [col.replace('_', ' ').replace('__', ' - ') for col in selected_columns]
+    return display_data
 
 def render_data_table(data, is_mobile=False):
     """Render an interactive data table with the provided data.
@@ -37,18 +59,7 @@ def render_data_table(data, is_mobile=False):
     
     # Allow column selection
     if not data.empty:
-        # Create a safe copy of the data for display
-        safe_data = data.copy()
-        
-        # Pre-process problematic columns (like coordinates with mixed types)
-        for col in safe_data.columns:
-            col_lower = str(col).lower()
-            # Handle coordinate columns that might contain non-numeric values
-            if 'lat' in col_lower or 'lon' in col_lower or 'lng' in col_lower:
-                # Convert to string to prevent conversion errors
-                safe_data[col] = safe_data[col].astype(str)
-        
-        all_columns = safe_data.columns.tolist()
+        all_columns = data.columns.tolist()
         
         # Define default columns to show
         default_columns = [
@@ -73,14 +84,8 @@ def render_data_table(data, is_mobile=False):
         if not selected_columns:  # If no columns are selected, use defaults
             selected_columns = default_columns
         
-        # Apply column selection
-        display_data = safe_data[selected_columns].copy()
-        
-        # Create a clean display version with better column names
-        display_data.columns = [col.replace('_', ' ').replace('__', ' - ') for col in selected_columns]
-        
         # Display row count and pagination options
-        row_count = len(display_data)
+        row_count = len(data)
         st.write(f"Displaying {row_count} deals")
         
         page_size_options = [10, 25, 50, 100]
@@ -112,10 +117,10 @@ def render_data_table(data, is_mobile=False):
             start_idx = (page_number - 1) * page_size
             end_idx = min(start_idx + page_size, row_count)
             
-            # Get data for current page
-            page_data = display_data.iloc[start_idx:end_idx]
+            # Slice the current page before any conversion so only visible rows are processed
+            page_data = _prepare_display_data(data.iloc[start_idx:end_idx], selected_columns)
         else:
-            page_data = display_data
+            page_data = _prepare_display_data(data, selected_columns)
         
         try:
             # Display the table - use 'unsafe_allow_html' for better compatibility
@@ -141,6 +146,8 @@ def render_data_table(data, is_mobile=False):
         
         with export_col2:
             if st.button("Export Selected Data"):
+                display_data = _prepare_display_data(data, selected_columns)
+                
                 if export_format == "CSV":
                     export_data = display_data.to_csv(index=False)
                     st.download_button(
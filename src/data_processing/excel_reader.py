@@ -24,7 +24,9 @@ except ImportError:
 
 # Import configuration
 import sys
-sys.path.append(str(Path(__file__).resolve().parents[2]))  # Add project root to path
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:  # Add project root to path
+    sys.path.append(project_root)
 from config.config import REFERENCE_FILE, REFERENCE_SHEET
 
 # Configure logging
@@ -6,14 +6,18 @@ specified criteria for underwriting models.
 """
 
 import os
+import bisect
 import datetime
 from pathlib import Path
 import logging
-from typing import Dict, List, Tuple, Any
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple, Any, Optional
 
 # Import configuration
 import sys
-sys.path.append(str(Path(__file__).resolve().parents[2]))  # Add project root to path
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:  # Add project root to path
+    sys.path.append(project_root)
 from config.config import (
     DEALS_ROOT, 
     DEAL_STAGE_DIRS, 
@@ -26,6 +30,16 @@ from config.config import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Lowercased file extensions, for a single str.endswith check
+_FILE_TYPES_TUPLE = tuple(file_type.lower() for file_type in FILE_TYPES)
+
+# Deal stage directories as sorted path prefixes (with a trailing separator),
+# so the stage containing a file can be found by binary search
+_STAGE_PREFIXES = sorted(os.path.join(str(deal_stage_dir), '') for deal_stage_dir in DEAL_STAGE_DIRS)
+
+# Minimum modification time as an st_mtime_ns value, parsed once at import
+MIN_MTIME_NS = int(datetime.datetime.strptime(MIN_MODIFIED_DATE, "%Y-%m-%d").timestamp() * 1_000_000_000)
+
 def get_deal_stage_name(directory_path: Path) -> str:
     """
     Extract the deal stage name from the directory path.
@@ -38,38 +52,56 @@ def get_deal_stage_name(directory_path: Path) -> str:
     """
     return directory_path.name
 
-def meets_file_criteria(file_path: Path) -> bool:
+def get_deal_stage_dir(file_path: Path) -> Optional[Path]:
+    """
+    Find the deal stage directory that contains a file.
+    
+    Args:
+        file_path: Path object representing the file
+        
+    Returns:
+        The deal stage directory, or None if the file is outside all of them
+    """
+    path_str = str(file_path)
+    # The only candidate is the last prefix that sorts at or before the path
+    i = bisect.bisect_right(_STAGE_PREFIXES, path_str) - 1
+    if i >= 0 and path_str.startswith(_STAGE_PREFIXES[i]):
+        return Path(_STAGE_PREFIXES[i])
+    return None
+
+def meets_file_criteria(file_path: Path, file_stat: Optional[os.stat_result] = None) -> bool:
     """
     Check if the file meets the criteria for inclusion in the data processing.
     
     Args:
         file_path: Path object representing the file
+        file_stat: Stat result for the file, if already known
         
     Returns:
         True if the file meets all criteria, False otherwise
     """
     # Check file extension
-    if not any(str(file_path).lower().endswith(ext) for ext in FILE_TYPES):
-        logger.debug(f"File {file_path} excluded: Not an approved Excel type")
+    if not file_path.name.lower().endswith(_FILE_TYPES_TUPLE):
+        logger.debug("File %s excluded: Not an approved Excel type", file_path)
         return False
     
     # Check filename includes required text
     file_name = file_path.name
     if not all(include in file_name for include in FILE_INCLUDES):
-        logger.debug(f"File {file_path} excluded: Missing required text in filename")
+        logger.debug("File %s excluded: Missing required text in filename", file_path)
         return False
     
     # Check filename does not include excluded text
     if any(exclude in file_name for exclude in FILE_EXCLUDES):
-        logger.debug(f"File {file_path} excluded: Contains excluded text in filename")
+        logger.debug("File %s excluded: Contains excluded text in filename", file_path)
         return False
     
     # Check last modified date
     try:
-        mod_time = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-        min_date = datetime.datetime.strptime(MIN_MODIFIED_DATE, "%Y-%m-%d")
-        if mod_time < min_date:
-            logger.debug(f"File {file_path} excluded: Last modified date too old")
+        if file_stat is None:
+            file_stat = os.stat(file_path)
+        if file_stat.st_mtime_ns < MIN_MTIME_NS:
+            logger.debug("File %s excluded: Last modified date too old", file_path)
             return False
     except Exception as e:
         logger.error(f"Error checking modified date for {file_path}: {str(e)}")
@@ -77,33 +109,98 @@ def meets_file_criteria(file_path: Path) -> bool:
     
     return True
 
-def collect_file_metadata(file_path: Path, deal_stage_dir: Path) -> Dict[str, Any]:
+def collect_file_metadata(file_path: Path, deal_stage_dir: Path,
+                          file_stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
     """
     Collect metadata about a file.
     
     Args:
         file_path: Path object representing the file
         deal_stage_dir: Path object representing the deal stage directory
+        file_stat: Stat result for the file, if already known
         
     Returns:
         Dictionary containing file metadata
     """
     try:
-        mod_time = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-        file_size = os.path.getsize(file_path)
+        if file_stat is None:
+            file_stat = os.stat(file_path)
         
         return {
             "File Name": file_path.name,
             "Absolute File Path": str(file_path),
             "Deal Stage Subdirectory Name": get_deal_stage_name(deal_stage_dir),
             "Deal Stage Subdirectory Path": str(deal_stage_dir),
-            "Last Modified Date": mod_time,
-            "File Size in Bytes": file_size
+            "Last Modified Date": datetime.datetime.fromtimestamp(file_stat.st_mtime),
+            "File Size in Bytes": file_stat.st_size
         }
     except Exception as e:
         logger.error(f"Error collecting metadata for {file_path}: {str(e)}")
         return {}
 
+class _CachedStat(NamedTuple):
+    """
+    The stat() fields the criteria and metadata checks read, rebuilt from a cache key.
+    
+    Passed as file_stat on a cache miss, so the file isn't stat()ed a second time.
+    """
+    st_mtime_ns: int
+    st_size: int
+    
+    @property
+    def st_mtime(self) -> float:
+        return self.st_mtime_ns / 1_000_000_000
+
+@lru_cache(maxsize=4096)
+def meets_file_criteria_cached(file_path: str, mtime_ns: int, size: int) -> bool:
+    """
+    Cached version of meets_file_criteria for repeated checks of the same file.
+    
+    The modification time and size are part of the cache key, so a file that
+    changes again is re-checked while duplicate events for one save are not.
+    
+    Args:
+        file_path: Path to the file
+        mtime_ns: File modification time in nanoseconds, from stat()
+        size: File size in bytes, from stat()
+        
+    Returns:
+        True if the file meets all criteria, False otherwise
+    """
+    return meets_file_criteria(Path(file_path), _CachedStat(mtime_ns, size))
+
+@lru_cache(maxsize=4096)
+def _collect_file_metadata_cached(file_path: str, deal_stage_dir: str, mtime_ns: int,
+                                  size: int) -> Tuple[Tuple[str, Any], ...]:
+    """
+    Cache collect_file_metadata results as immutable tuples of items.
+    """
+    return tuple(collect_file_metadata(Path(file_path), Path(deal_stage_dir),
+                                       _CachedStat(mtime_ns, size)).items())
+
+def collect_file_metadata_cached(file_path: str, deal_stage_dir: str, mtime_ns: int,
+                                 size: int) -> Dict[str, Any]:
+    """
+    Cached version of collect_file_metadata, keyed like meets_file_criteria_cached.
+    
+    Args:
+        file_path: Path to the file
+        deal_stage_dir: Path to the deal stage directory
+        mtime_ns: File modification time in nanoseconds, from stat()
+        size: File size in bytes, from stat()
+        
+    Returns:
+        Dictionary containing file metadata (a new copy on every call)
+    """
+    return dict(_collect_file_metadata_cached(file_path, deal_stage_dir, mtime_ns, size))
+
+def clear_cache() -> None:
+    """
+    Clear the cached file criteria and metadata results.
+    """
+    meets_file_criteria_cached.cache_clear()
+    _collect_file_metadata_cached.cache_clear()
+
 def find_uw_model_folder(deal_folder: Path) -> Path:
     """
     Find the "UW Model" folder within a deal folder.
@@ -114,17 +211,21 @@ def find_uw_model_folder(deal_folder: Path) -> Path:
     Returns:
         Path to the UW Model folder if found, None otherwise
     """
-    # Look for folder named "UW Model" (case insensitive)
-    for folder in deal_folder.iterdir():
-        if folder.is_dir() and folder.name.lower() == "uw model":
-            return folder
+    # Look for folder named "UW Model" (case insensitive), listing the deal
+    # folder only once and keeping its subfolders for the deeper search
+    with os.scandir(deal_folder) as entries:
+        subfolders = [entry.path for entry in entries if entry.is_dir()]
+    
+    for subfolder in subfolders:
+        if os.path.basename(subfolder).lower() == "uw model":
+            return Path(subfolder)
     
     # If not found directly, search one level deeper
-    for subfolder in deal_folder.iterdir():
-        if subfolder.is_dir():
-            for folder in subfolder.iterdir():
-                if folder.is_dir() and folder.name.lower() == "uw model":
-                    return folder
+    for subfolder in subfolders:
+        with os.scandir(subfolder) as entries:
+            for entry in entries:
+                if entry.is_dir() and entry.name.lower() == "uw model":
+                    return Path(entry.path)
     
     return None
 
@@ -151,39 +252,48 @@ def find_underwriting_files() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]
                 
             logger.info(f"Processing deal stage: {get_deal_stage_name(deal_stage_path)}")
             
-            # Process each deal folder within the deal stage directory
-            for deal_folder in deal_stage_path.iterdir():
-                if not deal_folder.is_dir():
-                    continue
-                    
-                logger.debug(f"Processing deal folder: {deal_folder.name}")
+            # Process each deal folder within the deal stage directory. scandir
+            # entries carry their file type, so no extra stat per entry is needed
+            with os.scandir(deal_stage_path) as entries:
+                deal_folders = [Path(entry.path) for entry in entries if entry.is_dir()]
+            
+            for deal_folder in deal_folders:
+                logger.debug("Processing deal folder: %s", deal_folder.name)
                 
                 # Find the UW Model folder
                 uw_model_folder = find_uw_model_folder(deal_folder)
                 
                 if not uw_model_folder:
-                    logger.debug(f"No UW Model folder found in {deal_folder.name}")
+                    logger.debug("No UW Model folder found in %s", deal_folder.name)
                     continue
                 
-                logger.debug(f"Found UW Model folder in {deal_folder.name}")
+                logger.debug("Found UW Model folder in %s", deal_folder.name)
                 
-                # Process each file in the UW Model folder
-                for file_path in uw_model_folder.iterdir():
-                    if not file_path.is_file():
-                        continue
-                        
-                    file_metadata = collect_file_metadata(file_path, deal_stage_path)
+                # Process each file in the UW Model folder, stating each one once
+                # and sharing the result between metadata and criteria checks
+                file_entries = []
+                with os.scandir(uw_model_folder) as entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        try:
+                            file_entries.append((Path(entry.path), entry.stat()))
+                        except OSError as e:
+                            logger.warning(f"Could not collect metadata for {entry.path}: {str(e)}")
+                
+                for file_path, file_stat in file_entries:
+                    file_metadata = collect_file_metadata(file_path, deal_stage_path, file_stat)
                     
                     if not file_metadata:
                         logger.warning(f"Could not collect metadata for {file_path}")
                         continue
                     
-                    if meets_file_criteria(file_path):
+                    if meets_file_criteria(file_path, file_stat):
                         included_files.append(file_metadata)
                         logger.info(f"Including file: {file_path.name}")
                     else:
                         excluded_files.append(file_metadata)
-                        logger.debug(f"Excluding file: {file_path.name}")
+                        logger.debug("Excluding file: %s", file_path.name)
     
     except Exception as e:
         logger.error(f"Error finding underwriting files: {str(e)}", exc_info=True)
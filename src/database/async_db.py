@@ -0,0 +1,231 @@
+"""
+Async Database Access Module
+
+This module provides asyncio versions of the dashboard's read queries, so async
+request handlers can run several reads concurrently over a shared pool of
+connections. Ingest keeps using the synchronous DatabaseManager.
+
+Requires the optional aiosqlite and aiosqlitepool packages; without them each
+function raises ImportError. As in db_manager, query errors are logged and
+returned as an empty result.
+"""
+
+import logging
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
+try:
+    import aiosqlite
+    from aiosqlitepool import SQLiteConnectionPool
+    ASYNC_SUPPORT = True
+except ImportError:
+    ASYNC_SUPPORT = False
+
+from src.database.db_manager import (
+    CONNECTION_PRAGMAS,
+    DATABASE_PATH,
+    DATABASE_TABLE,
+    SEARCH_COLUMNS,
+    _build_filter_conditions,
+    _build_filter_sql,
+    _build_search_query,
+    _sanitize_column_name,
+)
+from src.database.sqlite_utils import journal_pragmas
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_pool: Optional["SQLiteConnectionPool"] = None
+
+async def _connection_factory() -> "aiosqlite.Connection":
+    """
+    Open a connection for the pool, applying the same PRAGMAs as the sync module.
+
+    Returns:
+        Configured aiosqlite connection
+    """
+    conn = await aiosqlite.connect(DATABASE_PATH)
+    for pragma in journal_pragmas(DATABASE_PATH) + CONNECTION_PRAGMAS:
+        await conn.execute(pragma)
+    return conn
+
+def _get_pool() -> "SQLiteConnectionPool":
+    """
+    Get the async connection pool, creating it on first use.
+
+    Returns:
+        Module-wide connection pool
+    """
+    global _pool
+    if not ASYNC_SUPPORT:
+        raise ImportError("aiosqlite and aiosqlitepool are required for async database access")
+    if _pool is None:
+        _pool = SQLiteConnectionPool(connection_factory=_connection_factory)
+    return _pool
+
+async def _read_query(query: str, params: Optional[List[Any]] = None) -> pd.DataFrame:
+    """
+    Run a SELECT on a pooled connection and return the rows as a DataFrame.
+
+    Args:
+        query: SQL query to execute
+        params: Query parameters
+
+    Returns:
+        DataFrame of query results
+    """
+    async with _get_pool().connection() as conn:
+        cursor = await conn.execute(query, params or [])
+        rows = await cursor.fetchall()
+        columns = [description[0] for description in cursor.description]
+        await cursor.close()
+    return pd.DataFrame(rows, columns=columns)
+
+async def _get_schema() -> Dict[str, str]:
+    """
+    Get the table's columns and declared types.
+
+    Returns:
+        Mapping of column name to declared type
+    """
+    async with _get_pool().connection() as conn:
+        cursor = await conn.execute(f"PRAGMA table_info({DATABASE_TABLE})")
+        rows = await cursor.fetchall()
+        await cursor.close()
+    return {row[1]: row[2] for row in rows}
+
+async def _get_fts_columns() -> List[str]:
+    """
+    Get the columns covered by db_manager's trigram search index.
+
+    Returns:
+        List of indexed column names, empty if there is no trigram index
+    """
+    fts_table = f"{DATABASE_TABLE}_fts"
+    async with _get_pool().connection() as conn:
+        cursor = await conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (fts_table,)
+        )
+        row = await cursor.fetchone()
+        await cursor.close()
+        if not row or 'trigram' not in row[0]:
+            return []
+        cursor = await conn.execute(f"PRAGMA table_info({fts_table})")
+        rows = await cursor.fetchall()
+        await cursor.close()
+    return [row[1] for row in rows]
+
+async def close_pool() -> None:
+    """
+    Close all pooled connections, e.g. on application shutdown.
+    """
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+async def get_all_data(columns: Optional[List[str]] = None,
+                       include_metadata: bool = False) -> pd.DataFrame:
+    """
+    Retrieve all data from the database.
+
+    Args:
+        columns: Optional list of columns to retrieve (default: all columns)
+        include_metadata: Whether to include the Metadata JSON column when
+            retrieving all columns
+
+    Returns:
+        DataFrame containing all data from the database
+    """
+    _get_pool()
+    try:
+        if columns:
+            select_list = ", ".join(_sanitize_column_name(column) for column in columns)
+        elif include_metadata:
+            select_list = "*"
+        else:
+            select_list = ", ".join(
+                column for column in await _get_schema() if column != 'Metadata'
+            )
+        df = await _read_query(f"SELECT {select_list} FROM {DATABASE_TABLE}")
+        logger.info(f"Retrieved {len(df)} rows from database")
+        return df
+    except Exception as e:
+        logger.error(f"Error retrieving all data: {str(e)}", exc_info=True)
+        return pd.DataFrame()
+
+async def get_filtered_data(filters: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Retrieve filtered data from the database.
+
+    Args:
+        filters: Dictionary of column names and values to filter by, in the same
+            format as db_manager.get_filtered_data
+
+    Returns:
+        DataFrame containing filtered data
+    """
+    _get_pool()
+    try:
+        conditions, values = _build_filter_conditions(filters, await _get_schema())
+        df = await _read_query(_build_filter_sql(conditions), values)
+        logger.info(f"Retrieved {len(df)} filtered rows from database")
+        return df
+    except Exception as e:
+        logger.error(f"Error retrieving filtered data: {str(e)}", exc_info=True)
+        return pd.DataFrame()
+
+async def search_data(search_term: str) -> pd.DataFrame:
+    """
+    Search the SEARCH_COLUMNS for the term as a substring, as db_manager does.
+
+    Args:
+        search_term: Term to search for
+
+    Returns:
+        DataFrame containing search results
+    """
+    _get_pool()
+    try:
+        if not search_term.strip():
+            return await get_all_data(include_metadata=True)
+
+        schema = await _get_schema()
+        columns = [column for column in SEARCH_COLUMNS if column in schema]
+        if not columns:
+            logger.warning("No searchable columns found")
+            return pd.DataFrame()
+        query, params = _build_search_query(search_term, columns, await _get_fts_columns())
+        df = await _read_query(query, params)
+        logger.info(f"Found {len(df)} rows matching search term: {search_term}")
+        return df
+    except Exception as e:
+        logger.error(f"Error searching data: {str(e)}", exc_info=True)
+        return pd.DataFrame()
+
+async def get_column_values(column_name: str) -> List[Any]:
+    """
+    Get unique values for a specific column.
+
+    Args:
+        column_name: Name of the column
+
+    Returns:
+        List of unique values for the column
+    """
+    _get_pool()
+    try:
+        sanitized_column = _sanitize_column_name(column_name)
+        async with _get_pool().connection() as conn:
+            cursor = await conn.execute(
+                f"SELECT DISTINCT {sanitized_column} FROM {DATABASE_TABLE} "
+                f"WHERE {sanitized_column} IS NOT NULL"
+            )
+            rows = await cursor.fetchall()
+            await cursor.close()
+        return [row[0] for row in rows]
+    except Exception as e:
+        logger.error(f"Error getting column values: {str(e)}", exc_info=True)
+        return []
@@ -7,50 +7,552 @@ updating existing data, and providing query functionality for the dashboard.
 """
 
 import os
+import queue
+import re
 import sqlite3
+import threading
 import pandas as pd
 import numpy as np
 import logging
 import json
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Union, Optional
-from datetime import datetime
+from typing import Dict, List, Any, Tuple, Union, Optional, Iterator
+from datetime import date, datetime, time as time_of_day
+from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
 
 # Import configuration
 import sys
-sys.path.append(str(Path(__file__).resolve().parents[2]))  # Add project root to path
-from config.config import DATABASE_PATH, DATABASE_TABLE
+project_root = str(Path(__file__).resolve().parents[2])
+if project_root not in sys.path:  # Add project root to path
+    sys.path.append(project_root)
+from config.config import DATABASE_PATH, DATABASE_TABLE, ensure_dirs
+from src.database.sqlite_utils import journal_pragmas
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Chunk size for IN (...) lookups, kept well under SQLite's default limit of 999
+# bound parameters per statement
+SQLITE_MAX_PARAMS = 500
+
+# Maximum bound parameters per statement (raised from 999 in SQLite 3.32)
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+# INSERT ... ON CONFLICT DO UPDATE needs SQLite 3.24
+UPSERT_SUPPORT = sqlite3.sqlite_version_info >= (3, 24, 0)
+
+# Number of rows fetched per chunk when reading whole tables
+READ_CHUNK_SIZE = 50000
+
+# The FTS5 trigram tokenizer (SQLite 3.34) matches arbitrary substrings, so the
+# search index can answer the same queries as a LIKE '%term%' scan
+TRIGRAM_SUPPORT = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+# Shortest search term the trigram index can match; shorter terms use LIKE
+FTS_MIN_TERM_LENGTH = 3
+
+# Columns searched by search_data and covered by the FTS5 index, where they exist.
+# Kept to identifying fields so the index stays small and cheap to maintain.
+SEARCH_COLUMNS = (
+    "File_Name",
+    "Deal_Stage_Subdirectory_Name",
+    "Deal_Name",
+    "Property_Name",
+    "Address",
+    "City",
+    "State",
+    "Market",
+    "Submarket",
+    "Property_Type",
+    "Property_Class",
+    "Deal_Status",
+)
+
+# Indexes on the columns the dashboard filters by most, created with the table.
+# SQLite indexes always carry the rowid (id), so lookups that only need the id
+# are answered from the index alone.
+FILTER_INDEXES = {
+    "Deal_Stage_Subdirectory_Name": "idx_deal_stage",
+    "Date_Uploaded": "idx_date_uploaded",
+    "Last_Modified_Date": "idx_last_modified",
+}
+
+# Indexes on extracted data columns the dashboard filters by, created by the writer
+# once the columns exist. Named as db_manager_optimized names them so the same
+# index isn't created twice.
+DATA_FILTER_INDEXES = {
+    column: f"idx_{DATABASE_TABLE}_{column}"
+    for column in ("Property_Type", "Market", "Deal_Status", "Property_Class")
+}
+
+# Stored in PRAGMA user_version once every DATA_FILTER_INDEXES index exists
+INDEX_SCHEMA_VERSION = 1
+
+# Per-connection settings applied on connect, after the journal mode chosen by
+# sqlite_utils.journal_pragmas (WAL where the file system supports it, which
+# allows readers alongside the writer). The cache/mmap sizes keep repeated
+# dashboard reads in memory.
+CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size = -20000",  # ~20 MB page cache
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # 256 MB
+    "PRAGMA busy_timeout = 5000",
+)
+
+# Characters not allowed in sanitized column names (\W is Unicode-aware, matching
+# the str.isalnum() check it replaces)
+_NON_IDENTIFIER_RE = re.compile(r'\W')
+
+@lru_cache(maxsize=4096)
+def _sanitize_column_name(column_name: str) -> str:
+    """
+    Sanitize column names for use in SQL statements.
+    
+    Results are memoized, since the same few hundred column names are sanitized
+    for every row that is stored.
+    
+    Args:
+        column_name: Original column name
+        
+    Returns:
+        Sanitized column name
+    """
+    # Replace spaces, parentheses, and other special characters with underscores
+    sanitized = _NON_IDENTIFIER_RE.sub('_', column_name)
+    
+    # Make sure it doesn't start with a number
+    if sanitized[:1].isdigit():
+        sanitized = 'col_' + sanitized
+        
+    # Truncate to a reasonable length if needed
+    if len(sanitized) > 63:  # Standard SQL maximum identifier length
+        sanitized = sanitized[:63]
+        
+    return sanitized
+
+@lru_cache(maxsize=256)
+def _build_insert_sql(columns: Tuple[str, ...], rows: int = 1) -> str:
+    """
+    Build the INSERT statement for a set of sanitized columns.
+    
+    Callers pass columns in a canonical (sorted) order, so each column set maps
+    to one SQL string and hits SQLite's per-connection statement cache.
+    
+    Args:
+        columns: Sanitized column names
+        rows: Number of rows inserted by one statement
+        
+    Returns:
+        INSERT statement with one placeholder per column per row
+    """
+    placeholders = ", ".join(["(" + ", ".join(["?"] * len(columns)) + ")"] * rows)
+    return f"INSERT INTO {DATABASE_TABLE} ({', '.join(columns)}) VALUES {placeholders}"
+
+@lru_cache(maxsize=256)
+def _build_update_sql(columns: Tuple[str, ...]) -> str:
+    """
+    Build the UPDATE-by-id statement for a set of sanitized columns.
+    
+    Args:
+        columns: Sanitized column names
+        
+    Returns:
+        UPDATE statement taking the column values followed by the row id
+    """
+    set_clause = ", ".join([f"{col} = ?" for col in columns])
+    return f"UPDATE {DATABASE_TABLE} SET {set_clause} WHERE id = ?"
+
+@lru_cache(maxsize=256)
+def _build_upsert_sql(columns: Tuple[str, ...], stage_table: str) -> str:
+    """
+    Build the statement that merges a staging table into the main table.
+    
+    Rows whose Absolute_File_Path is already stored update that record in place;
+    the rest are inserted.
+    
+    Args:
+        columns: Sanitized column names present in the staging table
+        stage_table: Name of the staging table
+        
+    Returns:
+        INSERT ... SELECT ... ON CONFLICT DO UPDATE statement
+    """
+    column_list = ", ".join(columns)
+    set_clause = ", ".join(
+        f"{col} = excluded.{col}" for col in columns if col != 'Absolute_File_Path'
+    )
+    # WHERE true keeps SQLite from parsing ON CONFLICT as part of the SELECT's join
+    return (
+        f"INSERT INTO {DATABASE_TABLE} ({column_list}) "
+        f"SELECT {column_list} FROM {stage_table} WHERE true "
+        f"ON CONFLICT(Absolute_File_Path) DO UPDATE SET {set_clause}"
+    )
+
+@lru_cache(maxsize=256)
+def _build_filter_sql(conditions: Tuple[Tuple[str, str, int], ...]) -> str:
+    """
+    Build the SELECT statement for a set of filter conditions.
+    
+    Args:
+        conditions: (sanitized column, operator, placeholder count) per filter,
+            where the operator 'IN' takes that many placeholders
+        
+    Returns:
+        SELECT statement over the main table
+    """
+    where_clauses = []
+    for column, operator, count in conditions:
+        if operator == 'IN':
+            where_clauses.append(f"{column} IN ({', '.join(['?'] * count)})")
+        else:
+            where_clauses.append(f"{column} {operator} ?")
+    
+    query = f"SELECT * FROM {DATABASE_TABLE}"
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    return query
+
+def _build_filter_conditions(filters: Dict[str, Any],
+                             schema: Dict[str, str]) -> Tuple[Tuple[Tuple[str, str, int], ...], List[Any]]:
+    """
+    Describe the WHERE clause for a set of dashboard filters.
+    
+    Columns are sorted so the same filter set always reuses the same cached SQL
+    string from _build_filter_sql. Filters on columns not in the table are
+    skipped.
+    
+    Args:
+        filters: Dictionary of column names and values to filter by. A list
+            value matches any of its items, and a dict with 'operator' and
+            'value' keys applies that comparison.
+        schema: Mapping of the table's column names to declared types
+        
+    Returns:
+        Tuple of (conditions for _build_filter_sql, parameter values)
+    """
+    conditions = []
+    values = []
+    
+    for column, value in sorted(filters.items(), key=lambda item: _sanitize_column_name(item[0])):
+        sanitized_column = _sanitize_column_name(column)
+        if sanitized_column not in schema:
+            logger.warning(f"Ignoring filter on unknown column: {column}")
+            continue
+        
+        if isinstance(value, list):
+            # Handle list of values (IN clause)
+            conditions.append((sanitized_column, 'IN', len(value)))
+            values.extend(value)
+        elif isinstance(value, dict) and value.get('operator') and value.get('value') is not None:
+            # Handle custom operators
+            operator = value['operator']
+            if operator in ['=', '!=', '<', '<=', '>', '>=', 'LIKE']:
+                conditions.append((sanitized_column, operator, 1))
+                values.append(value['value'])
+        else:
+            # Simple equality
+            conditions.append((sanitized_column, '=', 1))
+            values.append(value)
+    
+    return tuple(conditions), values
+
+def _build_search_query(search_term: str, columns: List[str],
+                        fts_columns: List[str]) -> Tuple[str, List[Any]]:
+    """
+    Build the search query for a term over the given searchable columns.
+    
+    The FTS5 index answers the search when it covers exactly these columns and
+    the term is long enough for trigram matching; otherwise the columns are
+    scanned with LIKE. Both match the term as a case-insensitive substring.
+    
+    Args:
+        search_term: Term to search for
+        columns: Searchable columns present in the table
+        fts_columns: Columns covered by the trigram index (empty if none)
+        
+    Returns:
+        Tuple of (SQL, parameters)
+    """
+    fts_table = f"{DATABASE_TABLE}_fts"
+    if len(search_term) >= FTS_MIN_TERM_LENGTH and fts_columns and set(fts_columns) == set(columns):
+        # Quote the term so FTS5 query syntax in user input is matched literally
+        match = '"' + search_term.replace('"', '""') + '"'
+        query = (
+            f"SELECT t.* FROM {DATABASE_TABLE} t "
+            f"JOIN {fts_table} f ON f.rowid = t.id WHERE {fts_table} MATCH ?"
+        )
+        return query, [match]
+    
+    query = f"SELECT * FROM {DATABASE_TABLE} WHERE " + " OR ".join(
+        f"{column} LIKE ?" for column in columns
+    )
+    return query, [f"%{search_term}%"] * len(columns)
+
+def _isoformat_series(series: pd.Series) -> pd.Series:
+    """
+    Format a datetime column as ISO strings, matching Timestamp.isoformat().
+    
+    Fractional seconds are written only where present and UTC offsets as
+    +HH:MM, so values match those written one at a time by other writers.
+    
+    Args:
+        series: Series with a datetime64 or tz-aware datetime dtype
+        
+    Returns:
+        Series of ISO strings, with missing values left missing
+    """
+    if (series.dt.nanosecond.fillna(0) != 0).any():
+        # Sub-microsecond values are rare; format those columns value by value
+        return series.map(lambda value: value.isoformat(), na_action='ignore')
+    
+    text = series.dt.strftime('%Y-%m-%dT%H:%M:%S')
+    microseconds = series.dt.microsecond.fillna(0).astype(int)
+    has_fraction = microseconds != 0
+    if has_fraction.any():
+        text = text.where(~has_fraction, text + '.' + microseconds.astype(str).str.zfill(6))
+    if series.dt.tz is not None:
+        offset = series.dt.strftime('%z')
+        text = text + offset.str[:3] + ':' + offset.str[3:]
+    return text
+
+def _bindable_value(value: Any) -> Any:
+    """
+    Convert a value from an object column to a type sqlite3 binds natively.
+    
+    Numpy scalars become Python numbers and dates/times ISO strings. Missing
+    values and complex values (moved to Metadata later) are returned unchanged.
+    
+    Args:
+        value: Cell value
+        
+    Returns:
+        Value safe to bind
+    """
+    if value is None or value is pd.NaT:
+        return value
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, date, time_of_day)):
+        return value.isoformat()
+    return value
+
+def _prepare_for_binding(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a frame's values to types sqlite3 binds without registered adapters.
+    
+    Datetime columns are formatted column-wise, and only object columns, which
+    may hold numpy scalars or date/time objects, are converted value by value.
+    Numeric columns already become Python numbers when cast to object.
+    
+    Args:
+        df: DataFrame about to be stored
+        
+    Returns:
+        DataFrame with converted columns
+    """
+    converted = {}
+    for position, dtype in enumerate(df.dtypes):
+        column = df.columns[position]
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            converted[column] = _isoformat_series(df.iloc[:, position])
+        elif dtype == object:
+            converted[column] = df.iloc[:, position].map(_bindable_value)
+    return df.assign(**converted) if converted else df
+
+def _dumps_metadata(metadata: Dict[str, Any]) -> str:
+    """
+    Serialize a record's metadata to JSON.
+    
+    Uses orjson when installed, which encodes numpy arrays natively; anything
+    neither encoder understands is stored as its string form.
+    
+    Args:
+        metadata: Mapping of original column names to complex cell values
+        
+    Returns:
+        JSON string
+    """
+    if ORJSON_SUPPORT:
+        try:
+            return orjson.dumps(
+                metadata,
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder accepts
+            pass
+    return json.dumps(metadata, default=str)
+
+def _open_connection(db_path: Path) -> sqlite3.Connection:
+    """
+    Open a SQLite connection configured for this application.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        Connection in autocommit mode with the journal and CONNECTION_PRAGMAS applied
+    """
+    # Directories are only created once a connection is actually needed; the
+    # database may live outside the configured directory (e.g. benchmarks, tests)
+    ensure_dirs()
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    # Pooled connections may be handed to a different thread than the one that opened them
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=256)
+    # Autocommit mode: transactions are opened explicitly where needed
+    conn.isolation_level = None
+    for pragma in journal_pragmas(db_path) + CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _optimize_connection(conn: sqlite3.Connection) -> None:
+    """
+    Let SQLite refresh query planner statistics that have gone stale.
+    
+    PRAGMA optimize only analyzes tables whose statistics need it, so it is
+    close to free on a database that has not changed. Failures are logged and
+    otherwise ignored.
+    
+    Args:
+        conn: Connection to optimize
+    """
+    try:
+        conn.execute("PRAGMA analysis_limit = 400")
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error as e:
+        logger.warning(f"Error optimizing database: {str(e)}")
+
+class _ConnectionPool:
+    """
+    Pool of long-lived SQLite connections used by the module-level helpers.
+    
+    WAL mode allows one writer alongside many readers, so the pool keeps a single
+    writer connection and up to ``max_readers`` reader connections, created lazily
+    and reused across calls so their page caches stay warm.
+    """
+    
+    def __init__(self, db_path: Path, max_readers: Optional[int] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            max_readers: Maximum number of reader connections (default: CPU count)
+        """
+        self.db_path = db_path
+        self.max_readers = max_readers or os.cpu_count() or 4
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+    
+    @contextmanager
+    def acquire_reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a reader connection, opening a new one if the pool is not yet full.
+        
+        Yields:
+            SQLite connection, returned to the pool on exit
+        """
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                can_open = self._reader_count < self.max_readers
+                if can_open:
+                    self._reader_count += 1
+            
+            if can_open:
+                try:
+                    conn = _open_connection(self.db_path)
+                except Exception:
+                    with self._reader_lock:
+                        self._reader_count -= 1
+                    raise
+            else:
+                # Pool is full - wait for another caller to return a connection
+                conn = self._readers.get()
+        
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    @contextmanager
+    def acquire_writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow the single writer connection, waiting for any other writer to finish.
+        
+        Yields:
+            SQLite connection used for all writes
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = _open_connection(self.db_path)
+            yield self._writer
+
+_pool: Optional[_ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> _ConnectionPool:
+    """
+    Get the connection pool for the configured database, creating it on first use.
+    
+    Returns:
+        Module-wide connection pool
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _ConnectionPool(DATABASE_PATH)
+        return _pool
+
 class DatabaseManager:
     """
     Class to manage database operations for the Underwriting Dashboard.
     """
     
-    def __init__(self, db_path: Path = DATABASE_PATH):
+    # (schema_version, column name -> declared type) for each database path, shared by
+    # all instances and replaced (never mutated) whenever the table changes
+    _schema_caches: Dict[str, Tuple[int, Dict[str, str]]] = {}
+    
+    def __init__(self, db_path: Path = DATABASE_PATH, conn: Optional[sqlite3.Connection] = None):
         """
         Initialize the DatabaseManager with the database path.
         
         Args:
             db_path: Path to the SQLite database file
+            conn: Optional pre-acquired connection (e.g. from the connection pool).
+                When given it is used instead of opening a new connection, and it is
+                left open on disconnect.
         """
         self.db_path = db_path
         self.conn = None
         self.cursor = None
-        
-        # Ensure database directory exists
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._shared_conn = conn
     
     def connect(self) -> None:
         """
         Connect to the SQLite database.
         """
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            if self._shared_conn is not None:
+                self.conn = self._shared_conn
+            else:
+                self.conn = _open_connection(self.db_path)
+                logger.info(f"Connected to database: {self.db_path}")
             self.cursor = self.conn.cursor()
-            logger.info(f"Connected to database: {self.db_path}")
         except Exception as e:
             logger.error(f"Error connecting to database: {str(e)}", exc_info=True)
             raise
@@ -58,10 +560,18 @@ class DatabaseManager:
     def disconnect(self) -> None:
         """
         Disconnect from the SQLite database.
+        
+        A pre-acquired connection is left open so it can be returned to its pool.
         """
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
         if self.conn:
-            self.conn.close()
-            logger.info("Disconnected from database")
+            if self._shared_conn is None:
+                _optimize_connection(self.conn)
+                self.conn.close()
+                logger.info("Disconnected from database")
+            self.conn = None
     
     def setup_database(self) -> None:
         """
@@ -95,72 +605,155 @@ class DatabaseManager:
                     )
                 """)
                 
-                # Create an index on the file path for faster lookups
-                self.cursor.execute(f"""
-                    CREATE INDEX idx_file_path ON {DATABASE_TABLE} (Absolute_File_Path)
-                """)
-                
                 self.conn.commit()
                 logger.info(f"Table {DATABASE_TABLE} created successfully")
             else:
                 logger.info(f"Table {DATABASE_TABLE} already exists")
-                
+
+            self._load_schema(refresh=True)
+
+            # A unique file path lets store_data merge batches with one UPSERT. It also
+            # serves file path lookups, so the older non-unique index is dropped
+            try:
+                self.cursor.execute(f"""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_file_path_unique
+                    ON {DATABASE_TABLE} (Absolute_File_Path)
+                """)
+                self.cursor.execute("DROP INDEX IF EXISTS idx_file_path")
+            except sqlite3.IntegrityError:
+                logger.warning(
+                    f"Duplicate file paths in {DATABASE_TABLE}; updates will be written row by row"
+                )
+
+            for column, index_name in FILTER_INDEXES.items():
+                self.cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {DATABASE_TABLE} ({column})"
+                )
+
+            self._ensure_data_filter_indexes()
+            self._setup_search_index()
+
         except Exception as e:
             logger.error(f"Error setting up database: {str(e)}", exc_info=True)
             raise
         finally:
             self.disconnect()
-    
-    def _sanitize_column_name(self, column_name: str) -> str:
+
+    def _setup_search_index(self) -> None:
         """
-        Sanitize column names for use in SQL statements.
-        
-        Args:
-            column_name: Original column name
-            
-        Returns:
-            Sanitized column name
+        Create the FTS5 search index over the searchable columns and its sync triggers.
+
+        The index is an external-content trigram table, so it stores only the
+        inverted index, reads column values from the main table and matches
+        substrings like the LIKE scan it replaces. It covers the SEARCH_COLUMNS
+        that exist and is rebuilt here, during setup, when that set has grown;
+        until then search_data falls back to LIKE. If SQLite lacks FTS5 or the
+        trigram tokenizer the index is skipped.
         """
-        # Replace spaces, parentheses, and other special characters with underscores
-        sanitized = column_name.replace(' ', '_')
-        sanitized = ''.join(c if c.isalnum() or c == '_' else '_' for c in sanitized)
-        
-        # Make sure it doesn't start with a number
-        if sanitized[0].isdigit():
-            sanitized = 'col_' + sanitized
-            
-        # Truncate to a reasonable length if needed
-        if len(sanitized) > 63:  # Standard SQL maximum identifier length
-            sanitized = sanitized[:63]
-            
-        return sanitized
-    
+        fts_table = f"{DATABASE_TABLE}_fts"
+        columns = self._get_search_columns()
+
+        if not TRIGRAM_SUPPORT or not columns:
+            return
+        if set(self._get_fts_columns()) == set(columns):
+            return
+
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        self.cursor.execute("BEGIN IMMEDIATE")
+        try:
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_ai")
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_ad")
+            self.cursor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_au")
+            self.cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+            try:
+                self.cursor.execute(f"""
+                    CREATE VIRTUAL TABLE {fts_table} USING fts5(
+                        {column_list}, content='{DATABASE_TABLE}', content_rowid='id',
+                        tokenize='trigram'
+                    )
+                """)
+            except sqlite3.OperationalError as e:
+                if 'no such module' not in str(e) and 'no such tokenizer' not in str(e):
+                    raise
+                logger.warning(f"FTS5 unavailable, search will scan columns with LIKE: {str(e)}")
+                self.conn.rollback()
+                return
+
+            self.cursor.execute(f"""
+                CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {DATABASE_TABLE} BEGIN
+                    INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            """)
+            self.cursor.execute(f"""
+                CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {DATABASE_TABLE} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                END
+            """)
+            # Only updates touching an indexed column re-index the row
+            self.cursor.execute(f"""
+                CREATE TRIGGER {fts_table}_au AFTER UPDATE OF {column_list} ON {DATABASE_TABLE} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END
+            """)
 
-    def _convert_value_for_sqlite(self, value: Any) -> Any:
+            # Index the rows already stored
+            self.cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        logger.info(f"Search index {fts_table} built over {len(columns)} columns")
+
+    def _ensure_data_filter_indexes(self) -> None:
         """
-        Convert values to types that SQLite can handle.
-        
-        Args:
-            value: The value to convert
-            
+        Index the DATA_FILTER_INDEXES columns that exist and analyze the new indexes.
+
+        The columns only appear once files that contain them are stored, so this
+        runs on setup and after each schema change. PRAGMA user_version is set
+        only when every index exists, after which the check is skipped.
+        """
+        self.cursor.execute("PRAGMA user_version")
+        if self.cursor.fetchone()[0] >= INDEX_SCHEMA_VERSION:
+            return
+
+        schema = self._load_schema()
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        existing = {row[0] for row in self.cursor.fetchall()}
+
+        complete = True
+        for column, index_name in DATA_FILTER_INDEXES.items():
+            if column not in schema:
+                complete = False
+                continue
+            if index_name not in existing:
+                logger.info(f"Creating index {index_name}")
+                self.cursor.execute(f"CREATE INDEX {index_name} ON {DATABASE_TABLE} ({column})")
+                self.cursor.execute(f"ANALYZE {index_name}")
+
+        if complete:
+            self.cursor.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+
+    def _get_fts_columns(self) -> List[str]:
+        """
+        Get the columns covered by the trigram search index.
+
         Returns:
-            SQLite-compatible value
+            List of indexed column names, empty if there is no trigram index
         """
-        # Handle pandas Timestamp objects
-        if pd.api.types.is_datetime64_any_dtype(type(value)) or hasattr(value, 'tzinfo'):
-            return value.isoformat()
-        
-        # Handle numpy types
-        if isinstance(value, np.integer):
-            return int(value)
-        if isinstance(value, np.floating):
-            return float(value)
-        if isinstance(value, np.ndarray):
-            return value.tolist()
-        
-        # Return other types as-is
-        return value     
-    
+        fts_table = f"{DATABASE_TABLE}_fts"
+        self.cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?",
+            (fts_table,)
+        )
+        row = self.cursor.fetchone()
+        if not row or 'trigram' not in row[0]:
+            return []
+        self.cursor.execute(f"PRAGMA table_info({fts_table})")
+        return [info[1] for info in self.cursor.fetchall()]
     
     def _add_column_if_not_exists(self, column_name: str, column_type: str = "TEXT") -> None:
         """
@@ -172,21 +765,56 @@ class DatabaseManager:
         """
         try:
             # Check if the column exists
-            self.cursor.execute(f"PRAGMA table_info({DATABASE_TABLE})")
-            columns = [info[1] for info in self.cursor.fetchall()]
+            schema = self._load_schema()
             
-            sanitized_column = self._sanitize_column_name(column_name)
+            sanitized_column = _sanitize_column_name(column_name)
             
-            if sanitized_column not in columns:
+            if sanitized_column not in schema:
                 logger.info(f"Adding column: {sanitized_column}")
                 self.cursor.execute(f"""
                     ALTER TABLE {DATABASE_TABLE} 
                     ADD COLUMN {sanitized_column} {column_type}
                 """)
-                self.conn.commit()
+                self._load_schema(refresh=True)
         except Exception as e:
             logger.warning(f"Error adding column {column_name}: {str(e)}")
     
+    def _load_schema(self, refresh: bool = False) -> Dict[str, str]:
+        """
+        Get the table's columns and declared types, reading them only when they changed.
+        
+        The cache is shared by every manager for the same database file and is
+        keyed on PRAGMA schema_version, which SQLite bumps whenever any connection
+        (including other processes) alters the schema. A cheap version check thus
+        replaces PRAGMA table_info on most calls.
+        
+        Args:
+            refresh: Re-read the schema even if the version is unchanged
+            
+        Returns:
+            Mapping of column name to declared type
+        """
+        key = str(self.db_path)
+        self.cursor.execute("PRAGMA schema_version")
+        version = self.cursor.fetchone()[0]
+        cached = self._schema_caches.get(key)
+        if cached is not None and cached[0] == version and not refresh:
+            return cached[1]
+        self.cursor.execute(f"PRAGMA table_info({DATABASE_TABLE})")
+        schema = {info[1]: info[2] for info in self.cursor.fetchall()}
+        self._schema_caches[key] = (version, schema)
+        return schema
+    
+    def _get_search_columns(self) -> List[str]:
+        """
+        Get the SEARCH_COLUMNS present in the table.
+        
+        Returns:
+            List of searchable column names
+        """
+        schema = self._load_schema()
+        return [column for column in SEARCH_COLUMNS if column in schema]
+    
     def _ensure_schema_compatibility(self, df: pd.DataFrame) -> None:
         """
         Ensure the database schema is compatible with the DataFrame by adding any missing columns.
@@ -198,28 +826,171 @@ class DatabaseManager:
         
         try:
             # Get current column info from the table
-            self.cursor.execute(f"PRAGMA table_info({DATABASE_TABLE})")
-            existing_columns = [info[1] for info in self.cursor.fetchall()]
+            schema = self._load_schema()
             
-            # Check each DataFrame column and add it if not in the table
+            # Collect the type of each DataFrame column missing from the table
+            new_columns = {}
             for column in df.columns:
                 # Skip core columns that we know already exist
                 if column in ['File Name', 'Absolute File Path', 'Deal Stage Subdirectory Name', 
                              'Deal Stage Subdirectory Path', 'Last Modified Date', 'File Size in Bytes']:
                     continue
                 
-                sanitized_column = self._sanitize_column_name(column)
-                if sanitized_column not in existing_columns:
+                sanitized_column = _sanitize_column_name(column)
+                if sanitized_column not in schema and sanitized_column not in new_columns:
                     # Determine column type based on DataFrame dtype
                     dtype = df[column].dtype
                     if pd.api.types.is_integer_dtype(dtype):
-                        self._add_column_if_not_exists(column, "INTEGER")
+                        new_columns[sanitized_column] = "INTEGER"
                     elif pd.api.types.is_float_dtype(dtype):
-                        self._add_column_if_not_exists(column, "REAL")
+                        new_columns[sanitized_column] = "REAL"
                     else:
-                        self._add_column_if_not_exists(column, "TEXT")
+                        new_columns[sanitized_column] = "TEXT"
+            
+            if not new_columns:
+                return
+            
+            # Run the ALTERs in the caller's transaction, committed with the data
+            for sanitized_column, column_type in new_columns.items():
+                try:
+                    self.cursor.execute(
+                        f"ALTER TABLE {DATABASE_TABLE} ADD COLUMN {sanitized_column} {column_type}"
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Error adding column {sanitized_column}: {str(e)}")
+            
+            logger.info(f"Added {len(new_columns)} columns")
+            # Re-read rather than assume every ALTER succeeded
+            self._load_schema(refresh=True)
+            
+            # Index new filter columns; the search index catches up on the next setup
+            self._ensure_data_filter_indexes()
         except Exception as e:
             logger.error(f"Error ensuring schema compatibility: {str(e)}", exc_info=True)
+            # Let store_data roll back rather than commit a batch on a half-updated schema
+            raise
+    
+    def _get_existing_ids(self, file_paths: Any) -> Dict[str, int]:
+        """
+        Look up the record ids of files that are already stored.
+        
+        Args:
+            file_paths: Absolute file paths to look up (duplicates are ignored)
+            
+        Returns:
+            Dictionary mapping each stored file path to its record id
+        """
+        unique_paths = list(dict.fromkeys(file_paths))
+        existing_ids = {}
+        
+        # Query in chunks that stay under SQLite's bound-parameter limit
+        for start in range(0, len(unique_paths), SQLITE_MAX_PARAMS):
+            chunk = unique_paths[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ", ".join(["?"] * len(chunk))
+            self.cursor.execute(f"""
+                SELECT Absolute_File_Path, id FROM {DATABASE_TABLE}
+                WHERE Absolute_File_Path IN ({placeholders})
+            """, chunk)
+            existing_ids.update(self.cursor.fetchall())
+        
+        return existing_ids
+    
+    def _insert_new_records(self, df: pd.DataFrame, sanitized_columns: Dict[str, str],
+                            current_date: str) -> int:
+        """
+        Insert a batch of new records with multi-row INSERT statements.
+        
+        Each statement inserts as many rows as SQLite's bound parameter limit
+        allows. List, dict, Series and array cells are moved into the Metadata
+        JSON, as in store_data's per-row path.
+        
+        Args:
+            df: DataFrame of records not yet in the database
+            sanitized_columns: Mapping of DataFrame columns to sanitized names
+            current_date: Upload date to record
+            
+        Returns:
+            Number of records inserted
+        """
+        is_complex = lambda value: isinstance(value, (list, dict, pd.Series, np.ndarray))
+        
+        # Find complex cells, only possible in object columns
+        complex_masks = {}
+        for position, column in enumerate(df.columns):
+            if df.dtypes.iloc[position] == object:
+                mask = df.iloc[:, position].map(is_complex)
+                if mask.any():
+                    complex_masks[position] = mask.to_numpy()
+        
+        frame = df.copy()
+        if complex_masks:
+            metadata = [{} for _ in range(len(frame))]
+            for position, mask in complex_masks.items():
+                column = df.columns[position]
+                values = df.iloc[:, position].to_numpy()
+                for row in np.flatnonzero(mask):
+                    metadata[row][column] = values[row]
+                frame.iloc[mask, position] = None
+            metadata_json = [_dumps_metadata(row_metadata) for row_metadata in metadata]
+        else:
+            metadata_json = _dumps_metadata({})
+        
+        frame.columns = [sanitized_columns[column] for column in df.columns]
+        # Keep the last of any columns that sanitize to the same name
+        frame = frame.loc[:, ~frame.columns.duplicated(keep='last')]
+        frame['Date_Uploaded'] = current_date
+        frame['Metadata'] = metadata_json
+        
+        columns = tuple(frame.columns)
+        values = frame.astype(object).where(frame.notna(), None).to_numpy()
+        
+        # Stay under SQLite's bound parameter limit for each multi-row INSERT
+        rows_per_statement = max(1, SQLITE_MAX_VARIABLES // len(columns))
+        for start in range(0, len(values), rows_per_statement):
+            chunk = values[start:start + rows_per_statement]
+            self.cursor.execute(_build_insert_sql(columns, len(chunk)), chunk.ravel().tolist())
+        
+        return len(values)
+    
+    def _can_upsert(self) -> bool:
+        """
+        Check whether records can be merged on Absolute_File_Path with UPSERT.
+        
+        Returns:
+            True if SQLite supports UPSERT and the unique file path index exists
+        """
+        if not UPSERT_SUPPORT:
+            return False
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_file_path_unique'"
+        )
+        return self.cursor.fetchone() is not None
+    
+    def _upsert_rows(self, columns: Tuple[str, ...], rows: List[List[Any]]) -> None:
+        """
+        Insert or update rows through a temporary staging table.
+        
+        The rows are bulk-loaded into the staging table and merged into the main
+        table with a single INSERT ... ON CONFLICT statement.
+        
+        Args:
+            columns: Sanitized column names, in the order of each row's values
+            rows: Row values to write
+        """
+        stage_table = f"stage_{DATABASE_TABLE}"
+        column_list = ", ".join(columns)
+        placeholders = ", ".join(["?"] * len(columns))
+        
+        self.cursor.execute(
+            f"CREATE TEMP TABLE {stage_table} AS SELECT {column_list} FROM {DATABASE_TABLE} WHERE 0"
+        )
+        try:
+            self.cursor.executemany(
+                f"INSERT INTO {stage_table} ({column_list}) VALUES ({placeholders})", rows
+            )
+            self.cursor.execute(_build_upsert_sql(columns, stage_table))
+        finally:
+            self.cursor.execute(f"DROP TABLE {stage_table}")
     
     def store_data(self, df: pd.DataFrame) -> None:
         """
@@ -237,77 +1008,97 @@ class DatabaseManager:
         try:
             self.connect()
             
+            # Write everything, including schema changes, in one transaction; IMMEDIATE
+            # takes the write lock up front instead of failing with SQLITE_BUSY partway through
+            self.cursor.execute("BEGIN IMMEDIATE")
+            
             # Ensure all required columns exist in the database
             self._ensure_schema_compatibility(df)
             
-            # Process each row in the DataFrame
             current_date = datetime.now().strftime("%m-%d-%Y")
             
-            for _, row in df.iterrows():
-                file_path = row['Absolute File Path']
-                
-                # Check if this file is already in the database
-                self.cursor.execute(f"""
-                    SELECT id FROM {DATABASE_TABLE} 
-                    WHERE Absolute_File_Path = ?
-                """, (file_path,))
-                
-                existing_record = self.cursor.fetchone()
+            # Look up the ids of files already in the database up front
+            existing_ids = self._get_existing_ids(df['Absolute File Path'])
+            
+            # Prepare every row first, grouping rows by their column set so each
+            # group can be written with a single executemany call
+            inserts: Dict[Tuple[str, ...], List[List[Any]]] = {}
+            updates: Dict[Tuple[str, ...], List[List[Any]]] = {}
+            
+            # Convert dates and numpy scalars to bindable values once for the whole frame
+            df = _prepare_for_binding(df)
+            
+            # Sanitize each column name once rather than once per cell
+            sanitized_columns = {column: _sanitize_column_name(column) for column in df.columns}
+            
+            # Put columns in sorted order so the same column set always produces the
+            # same SQL text, whatever order the source file listed them in
+            column_order = sorted(range(len(df.columns)), key=lambda i: sanitized_columns[df.columns[i]])
+            df = df.iloc[:, column_order]
+            
+            # Batches of brand-new files skip the per-row loop entirely
+            if not existing_ids and df['Absolute File Path'].is_unique:
+                inserted = self._insert_new_records(df, sanitized_columns, current_date)
+                logger.info(f"Updated 0 and inserted {inserted} records")
+                self.conn.commit()
+                return
+            
+            # Replace NaN/NaT/None with None once for the whole frame, then walk
+            # the rows as a plain object array with positional column lookups
+            values = df.astype(object).where(df.notna(), None).to_numpy()
+            columns = [(column, sanitized_columns[column]) for column in df.columns]
+            path_position = list(df.columns).index('Absolute File Path')
+            
+            # With a unique file path index, new and existing records are written
+            # together by one UPSERT per column set
+            upsert = self._can_upsert()
+            updated_count = 0
+            
+            for row in values:
+                file_path = row[path_position]
                 
                 # Prepare data for insertion, handling complex types
                 row_data = {}
                 metadata = {}
                 
-                for column, value in row.items():
-                    sanitized_column = self._sanitize_column_name(column)
-                    
+                for (column, sanitized_column), value in zip(columns, row):
                     # Convert complex types to JSON strings for metadata storage
                     if isinstance(value, (list, dict, pd.Series, np.ndarray)):
                         metadata[column] = value
                         continue
                     
-                    # Handle NaN, None, etc.
-                    if pd.isna(value):
-                        row_data[sanitized_column] = None
-                    else:
-                        # Convert value to SQLite-compatible type
-                        row_data[sanitized_column] = self._convert_value_for_sqlite(value)
+                    # Values were made bindable by _prepare_for_binding
+                    row_data[sanitized_column] = value
                 
                 # Add the upload date
                 row_data['Date_Uploaded'] = current_date
                 
                 # Store metadata as JSON
-                row_data['Metadata'] = json.dumps(metadata, default=str)
+                row_data['Metadata'] = _dumps_metadata(metadata)
                 
-                if existing_record:
-                    # Update existing record
-                    record_id = existing_record[0]
-                    
-                    # Construct the SQL update statement
-                    set_clause = ", ".join([f"{col} = ?" for col in row_data.keys()])
-                    values = list(row_data.values()) + [record_id]
-                    
-                    update_sql = f"""
-                        UPDATE {DATABASE_TABLE}
-                        SET {set_clause}
-                        WHERE id = ?
-                    """
-                    
-                    self.cursor.execute(update_sql, values)
-                    logger.info(f"Updated record for: {file_path}")
+                columns_key = tuple(row_data.keys())
+                record_id = existing_ids.get(file_path)
+                if record_id is not None:
+                    updated_count += 1
+                if record_id is not None and not upsert:
+                    updates.setdefault(columns_key, []).append(list(row_data.values()) + [record_id])
                 else:
-                    # Insert new record
-                    columns = ", ".join(row_data.keys())
-                    placeholders = ", ".join(["?"] * len(row_data))
-                    values = list(row_data.values())
-                    
-                    insert_sql = f"""
-                        INSERT INTO {DATABASE_TABLE} ({columns})
-                        VALUES ({placeholders})
-                    """
-                    
-                    self.cursor.execute(insert_sql, values)
-                    logger.info(f"Inserted new record for: {file_path}")
+                    inserts.setdefault(columns_key, []).append(list(row_data.values()))
+            
+            # Update existing records
+            for columns_key, rows in updates.items():
+                self.cursor.executemany(_build_update_sql(columns_key), rows)
+            
+            # Insert new records (and, when upserting, update existing ones)
+            for columns_key, rows in inserts.items():
+                if upsert:
+                    self._upsert_rows(columns_key, rows)
+                else:
+                    self.cursor.executemany(_build_insert_sql(columns_key), rows)
+            
+            logger.info(
+                f"Updated {updated_count} and inserted {len(values) - updated_count} records"
+            )
             
             # Commit the changes
             self.conn.commit()
@@ -317,6 +1108,8 @@ class DatabaseManager:
             logger.error(f"Error storing data: {str(e)}", exc_info=True)
             if self.conn:
                 self.conn.rollback()
+                # Columns added in the rolled-back transaction no longer exist
+                self._schema_caches.pop(str(self.db_path), None)
         finally:
             self.disconnect()
     
@@ -355,19 +1148,38 @@ class DatabaseManager:
         finally:
             self.disconnect()
     
-    def get_all_data(self) -> pd.DataFrame:
+    def get_all_data(self, columns: Optional[List[str]] = None,
+                     include_metadata: bool = False) -> pd.DataFrame:
         """
         Retrieve all data from the database.
         
+        Args:
+            columns: Optional list of columns to retrieve (default: all columns).
+                Selecting only the needed columns avoids reading unused values.
+            include_metadata: Whether to include the Metadata JSON column when
+                retrieving all columns. It holds list/dict values moved out of
+                the data columns and is not needed by the dashboard views.
+        
         Returns:
             DataFrame containing all data from the database
         """
         try:
             self.connect()
             
-            # Get all data from the table
-            query = f"SELECT * FROM {DATABASE_TABLE}"
-            df = pd.read_sql_query(query, self.conn)
+            # Get the requested columns, or all columns without the Metadata blob
+            if columns:
+                select_list = ", ".join(_sanitize_column_name(column) for column in columns)
+            elif include_metadata:
+                select_list = "*"
+            else:
+                select_list = ", ".join(
+                    column for column in self._load_schema() if column != 'Metadata'
+                )
+            query = f"SELECT {select_list} FROM {DATABASE_TABLE}"
+            
+            # Read in chunks so rows are converted incrementally rather than in one buffer
+            chunks = list(pd.read_sql_query(query, self.conn, chunksize=READ_CHUNK_SIZE))
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
             
             logger.info(f"Retrieved {len(df)} rows from database")
             return df
@@ -391,33 +1203,10 @@ class DatabaseManager:
         try:
             self.connect()
             
-            # Construct WHERE clause from filters
-            where_clauses = []
-            values = []
-            
-            for column, value in filters.items():
-                sanitized_column = self._sanitize_column_name(column)
-                
-                if isinstance(value, list):
-                    # Handle list of values (IN clause)
-                    placeholders = ", ".join(["?"] * len(value))
-                    where_clauses.append(f"{sanitized_column} IN ({placeholders})")
-                    values.extend(value)
-                elif isinstance(value, dict) and value.get('operator') and value.get('value') is not None:
-                    # Handle custom operators
-                    operator = value['operator']
-                    if operator in ['=', '!=', '<', '<=', '>', '>=', 'LIKE']:
-                        where_clauses.append(f"{sanitized_column} {operator} ?")
-                        values.append(value['value'])
-                else:
-                    # Simple equality
-                    where_clauses.append(f"{sanitized_column} = ?")
-                    values.append(value)
+            conditions, values = _build_filter_conditions(filters, self._load_schema())
             
             # Build the query
-            query = f"SELECT * FROM {DATABASE_TABLE}"
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
+            query = _build_filter_sql(conditions)
             
             # Execute the query
             df = pd.read_sql_query(query, self.conn, params=values)
@@ -435,8 +1224,13 @@ class DatabaseManager:
         """
         Search for data in the database using a full-text search term.
         
+        Matches the term as a substring of any of the SEARCH_COLUMNS. The
+        trigram FTS5 index answers the search when it covers all of them;
+        otherwise, or for terms shorter than FTS_MIN_TERM_LENGTH, the columns
+        are scanned with LIKE.
+        
         Args:
-            search_term: Term to search for across all text columns
+            search_term: Term to search for
             
         Returns:
             DataFrame containing search results
@@ -444,40 +1238,15 @@ class DatabaseManager:
         try:
             self.connect()
             
-            # Get all column names from the table
-            self.cursor.execute(f"PRAGMA table_info({DATABASE_TABLE})")
-            columns = [info[1] for info in self.cursor.fetchall()]
-            
-            # Only search in TEXT columns
-            text_columns = []
-            for column in columns:
-                try:
-                    col_type = self.cursor.execute(f"SELECT typeof({column}) FROM {DATABASE_TABLE} LIMIT 1").fetchone()
-                    if col_type and col_type[0].upper() in ['TEXT', 'VARCHAR', 'CHAR', 'CLOB']:
-                        text_columns.append(column)
-                except:
-                    # Skip columns that cause errors
-                    pass
-            
-            # Construct the search query with LIKE clauses for each text column
-            search_clauses = []
-            values = []
-            
-            for column in text_columns:
-                search_clauses.append(f"{column} LIKE ?")
-                values.append(f"%{search_term}%")
-            
-            if not search_clauses:
-                logger.warning("No text columns found for search")
-                return pd.DataFrame()
-            
-            query = f"""
-                SELECT * FROM {DATABASE_TABLE}
-                WHERE {" OR ".join(search_clauses)}
-            """
-            
-            # Execute the query
-            df = pd.read_sql_query(query, self.conn, params=values)
+            if not search_term.strip():
+                df = pd.read_sql_query(f"SELECT * FROM {DATABASE_TABLE}", self.conn)
+            else:
+                columns = self._get_search_columns()
+                if not columns:
+                    logger.warning("No searchable columns found")
+                    return pd.DataFrame()
+                query, params = _build_search_query(search_term, columns, self._get_fts_columns())
+                df = pd.read_sql_query(query, self.conn, params=params)
             
             logger.info(f"Found {len(df)} rows matching search term: {search_term}")
             return df
@@ -501,13 +1270,10 @@ class DatabaseManager:
         try:
             self.connect()
             
-            sanitized_column = self._sanitize_column_name(column_name)
+            sanitized_column = _sanitize_column_name(column_name)
             
             # Check if the column exists
-            self.cursor.execute(f"PRAGMA table_info({DATABASE_TABLE})")
-            columns = [info[1] for info in self.cursor.fetchall()]
-            
-            if sanitized_column not in columns:
+            if sanitized_column not in self._load_schema():
                 logger.warning(f"Column {column_name} does not exist in the database")
                 return []
             
@@ -532,8 +1298,9 @@ def setup_database() -> None:
     Set up the database with the required tables.
     """
     try:
-        db_manager = DatabaseManager()
-        db_manager.setup_database()
+        pool = _get_pool()
+        with pool.acquire_writer() as conn:
+            DatabaseManager(pool.db_path, conn=conn).setup_database()
         logger.info("Database setup completed successfully")
     except Exception as e:
         logger.error(f"Error in database setup: {str(e)}", exc_info=True)
@@ -546,22 +1313,30 @@ def store_data(df: pd.DataFrame) -> None:
         df: DataFrame containing the data to store
     """
     try:
-        db_manager = DatabaseManager()
-        db_manager.store_data(df)
+        pool = _get_pool()
+        with pool.acquire_writer() as conn:
+            DatabaseManager(pool.db_path, conn=conn).store_data(df)
+            # The pooled writer is never closed, so refresh statistics after each batch
+            _optimize_connection(conn)
         logger.info("Data storage completed successfully")
     except Exception as e:
         logger.error(f"Error in data storage: {str(e)}", exc_info=True)
 
-def get_all_data() -> pd.DataFrame:
+def get_all_data(columns: Optional[List[str]] = None, include_metadata: bool = False) -> pd.DataFrame:
     """
     Retrieve all data from the database.
     
+    Args:
+        columns: Optional list of columns to retrieve (default: all columns)
+        include_metadata: Whether to include the Metadata JSON column
+    
     Returns:
         DataFrame containing all data from the database
     """
     try:
-        db_manager = DatabaseManager()
-        return db_manager.get_all_data()
+        pool = _get_pool()
+        with pool.acquire_reader() as conn:
+            return DatabaseManager(pool.db_path, conn=conn).get_all_data(columns, include_metadata)
     except Exception as e:
         logger.error(f"Error retrieving all data: {str(e)}", exc_info=True)
         return pd.DataFrame()
@@ -577,8 +1352,9 @@ def get_filtered_data(filters: Dict[str, Any]) -> pd.DataFrame:
         DataFrame containing filtered data from the database
     """
     try:
-        db_manager = DatabaseManager()
-        return db_manager.get_filtered_data(filters)
+        pool = _get_pool()
+        with pool.acquire_reader() as conn:
+            return DatabaseManager(pool.db_path, conn=conn).get_filtered_data(filters)
     except Exception as e:
         logger.error(f"Error retrieving filtered data: {str(e)}", exc_info=True)
         return pd.DataFrame()
@@ -594,8 +1370,9 @@ def search_data(search_term: str) -> pd.DataFrame:
         DataFrame containing search results
     """
     try:
-        db_manager = DatabaseManager()
-        return db_manager.search_data(search_term)
+        pool = _get_pool()
+        with pool.acquire_reader() as conn:
+            return DatabaseManager(pool.db_path, conn=conn).search_data(search_term)
     except Exception as e:
         logger.error(f"Error searching data: {str(e)}", exc_info=True)
         return pd.DataFrame()
@@ -611,8 +1388,9 @@ def get_column_values(column_name: str) -> List[Any]:
         List of unique values for the column
     """
     try:
-        db_manager = DatabaseManager()
-        return db_manager.get_column_values(column_name)
+        pool = _get_pool()
+        with pool.acquire_reader() as conn:
+            return DatabaseManager(pool.db_path, conn=conn).get_column_values(column_name)
     except Exception as e:
         logger.error(f"Error getting column values: {str(e)}", exc_info=True)
         return []
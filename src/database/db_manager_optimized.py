@@ -20,8 +20,15 @@ from datetime import datetime
 from contextlib import contextmanager
 from functools import lru_cache
 
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+    ADBC_SUPPORT = True
+except ImportError:
+    ADBC_SUPPORT = False
+
 # Import configuration
 from src.config.settings import settings
+from src.database.sqlite_utils import journal_pragmas, supports_wal
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -30,12 +37,24 @@ logger = logging.getLogger(__name__)
 _connection_pool = {}
 _connection_lock = threading.Lock()
 
+# SQLite tuning applied to every pooled connection: a 64 MB page cache
+# (negative cache_size is in KiB) and up to 256 MB of the file memory-mapped
+CACHE_SIZE_KIB = 65536
+MMAP_SIZE = 268435456
+
+# Dynamically added columns the dashboard filters on; indexed once they exist
+FILTER_INDEX_COLUMNS = ("Property_Type", "Market", "Deal_Status", "Property_Class")
+
 class DatabaseManager:
     """
     Optimized class to manage database operations for the Underwriting Dashboard.
     Includes connection pooling, prepared statements, and batch operations.
     """
     
+    # (schema_version, column list) per database path, shared by all managers so the
+    # short-lived managers created per call don't each re-read the schema
+    _column_caches: Dict[str, Tuple[int, List[str]]] = {}
+    
     def __init__(self, db_path: Path = None):
         """
         Initialize the DatabaseManager with the database path.
@@ -56,11 +75,6 @@ class DatabaseManager:
         # Prepared statements cache
         self._prepared_statements = {}
         
-        # Column cache
-        self._column_cache = None
-        self._column_cache_time = 0
-        self._column_cache_ttl = 60  # Cache TTL in seconds
-        
         # Initialize indexes cache
         self._indexes = set()
         
@@ -97,9 +111,12 @@ class DatabaseManager:
                 conn.execute("PRAGMA foreign_keys = ON")
                 
                 # Optimize SQLite settings
-                conn.execute("PRAGMA journal_mode = WAL")
-                conn.execute("PRAGMA synchronous = NORMAL")
-                conn.execute("PRAGMA cache_size = 10000")
+                for pragma in journal_pragmas(self.db_path):
+                    conn.execute(pragma)
+                if not supports_wal(self.db_path):
+                    logger.info(f"Database is on a network or synced drive, not enabling WAL: {self.db_path}")
+                conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+                conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
                 conn.execute("PRAGMA temp_store = MEMORY")
                 
                 # Register adapters and converters
@@ -241,12 +258,25 @@ class DatabaseManager:
         except Exception as e:
             logger.warning(f"Error creating index on {sanitized_column}: {str(e)}", exc_info=True)
     
+    def _ensure_filter_indexes(self):
+        """
+        Create indexes on the filter columns that exist in the table so far.
+        
+        These columns are added on demand from the Excel data, so this runs both
+        at setup and whenever new columns are added.
+        """
+        columns = self._get_columns()
+        for column in FILTER_INDEX_COLUMNS:
+            if column in columns:
+                self._ensure_index(column)
+    
     def setup_database(self):
         """
         Set up the database tables if they don't exist.
         """
         try:
             self.connect()
+            self._invalidate_column_cache()
             
             # Check if the table exists
             self.cursor.execute(f"""
@@ -287,6 +317,7 @@ class DatabaseManager:
                 self._ensure_index("Absolute_File_Path")
                 self._ensure_index("Deal_Stage_Subdirectory_Name")
                 self._ensure_index("Last_Modified_Date")
+                self._ensure_filter_indexes()
                 
         except Exception as e:
             logger.error(f"Error setting up database: {str(e)}", exc_info=True)
@@ -343,21 +374,26 @@ class DatabaseManager:
         # Return other types as-is
         return value
     
+    def _invalidate_column_cache(self) -> None:
+        """Drop the cached column list for this database."""
+        DatabaseManager._column_caches.pop(str(self.db_path), None)
+    
     def _get_columns(self, refresh: bool = False) -> List[str]:
         """
         Get the list of columns in the database table with caching.
         
+        The cache is checked against PRAGMA schema_version, which changes
+        whenever any connection (including another process) alters the schema,
+        and is also dropped by setup_database and when a column is added.
+        
         Args:
             refresh: Whether to force refresh the cache
             
         Returns:
             List of column names
         """
-        current_time = time.time()
-        
-        # Return cached columns if available and not expired
-        if not refresh and self._column_cache is not None and (current_time - self._column_cache_time) < self._column_cache_ttl:
-            return self._column_cache
+        cached = DatabaseManager._column_caches.get(str(self.db_path))
+        cached_columns = cached[1] if cached is not None else []
         
         # Track whether we need to disconnect at the end
         created_connection = False
@@ -371,26 +407,32 @@ class DatabaseManager:
             # Double-check that cursor is available after connection attempt
             if self.cursor is None:
                 logger.error("Failed to establish a database cursor")
-                return self._column_cache or []
+                return cached_columns
+            
+            # Return cached columns if the schema hasn't changed since they were read
+            self.cursor.execute("PRAGMA schema_version")
+            schema_version = self.cursor.fetchone()[0]
+            if not refresh and cached is not None and cached[0] == schema_version:
+                return cached_columns
                 
             # Execute the pragma query to get column info
             self.cursor.execute(f"PRAGMA table_info({self.table_name})")
             columns = [info[1] for info in self.cursor.fetchall()]
             
-            # Update cache
-            self._column_cache = columns
-            self._column_cache_time = current_time
+            # Update cache, unless the table doesn't exist yet
+            if columns:
+                DatabaseManager._column_caches[str(self.db_path)] = (schema_version, columns)
             
             return columns
         except sqlite3.Error as se:
             logger.error(f"SQLite error getting columns: {str(se)}")
             # If we have a connection error, force reconnection on next attempt
             self.cursor = None
-            return self._column_cache or []
+            return cached_columns
         except Exception as e:
             logger.error(f"Error getting columns: {str(e)}", exc_info=True)
             # Return empty list or cached columns if available
-            return self._column_cache or []
+            return cached_columns
         finally:
             # Only disconnect if we created the connection in this method
             if created_connection:
@@ -419,7 +461,7 @@ class DatabaseManager:
                 self.conn.commit()
                 
                 # Invalidate column cache
-                self._column_cache = None
+                self._invalidate_column_cache()
                 
         except Exception as e:
             logger.warning(f"Error adding column {column_name}: {str(e)}")
@@ -439,6 +481,7 @@ class DatabaseManager:
             existing_columns = self._get_columns(refresh=True)
             
             # Batch add missing columns
+            added_columns = False
             for column in df.columns:
                 # Skip core columns that we know already exist
                 if column in ['File Name', 'Absolute File Path', 'Deal Stage Subdirectory Name', 
@@ -455,6 +498,10 @@ class DatabaseManager:
                         self._add_column_if_not_exists(column, "REAL")
                     else:
                         self._add_column_if_not_exists(column, "TEXT")
+                    added_columns = True
+            
+            if added_columns:
+                self._ensure_filter_indexes()
         except Exception as e:
             logger.error(f"Error ensuring schema compatibility: {str(e)}", exc_info=True)
     
@@ -478,9 +525,19 @@ class DatabaseManager:
             # Ensure all required columns exist in the database
             self._ensure_schema_compatibility(df)
             
+            # Run the whole load as one write transaction, so the journal is
+            # synced once per call rather than per statement
+            if not self.conn.in_transaction:
+                self.cursor.execute("BEGIN IMMEDIATE")
+            
             # Process rows in batches
             current_date = datetime.now().strftime("%m-%d-%Y")
             
+            # Sanitize each column name once rather than once per value
+            columns = list(df.columns)
+            sanitized_columns = [self._sanitize_column_name(column) for column in columns]
+            file_path_index = columns.index('Absolute File Path')
+            
             # Get all existing file paths in one query
             self.cursor.execute(f"""
                 SELECT Absolute_File_Path, id FROM {self.table_name}
@@ -491,16 +548,15 @@ class DatabaseManager:
             updates = []
             inserts = []
             
-            for _, row in df.iterrows():
-                file_path = row['Absolute File Path']
+            # Plain tuples avoid building a Series (and upcasting dtypes) per row
+            for values in df.itertuples(index=False, name=None):
+                file_path = values[file_path_index]
                 
                 # Prepare data, handling complex types
                 row_data = {}
                 metadata = {}
                 
-                for column, value in row.items():
-                    sanitized_column = self._sanitize_column_name(column)
-                    
+                for column, sanitized_column, value in zip(columns, sanitized_columns, values):
                     # Convert complex types to JSON strings for metadata storage
                     if isinstance(value, (list, dict, pd.Series, np.ndarray)):
                         metadata[column] = value
@@ -560,8 +616,7 @@ class DatabaseManager:
                         batch_params.append(params)
                     
                     # Execute batch update
-                    for params in batch_params:
-                        self.cursor.execute(update_sql, params)
+                    self.cursor.executemany(update_sql, batch_params)
                     
                     logger.info(f"Updated {len(group)} records in batch")
             
@@ -694,19 +749,53 @@ class DatabaseManager:
         finally:
             self.disconnect()
     
+    def _read_arrow(self, query: str) -> pd.DataFrame:
+        """
+        Run a query through the ADBC SQLite driver and convert the Arrow result.
+        
+        Rows come back as Arrow columns rather than one Python tuple per row.
+        
+        Args:
+            query: SQL query to execute
+            
+        Returns:
+            DataFrame of query results
+        """
+        with adbc_sqlite.connect(str(self.db_path)) as conn, conn.cursor() as cursor:
+            cursor.execute(query)
+            table = cursor.fetch_arrow_table()
+        return table.to_pandas(self_destruct=True)
+    
     def get_all_data(self) -> pd.DataFrame:
         """
         Retrieve all data from the database.
         
+        Uses the optional ADBC driver when installed, falling back to sqlite3.
+        
         Returns:
             DataFrame containing all data from the database
         """
+        query = f"SELECT * FROM {self.table_name}"
+        
+        if ADBC_SUPPORT:
+            try:
+                df = self._read_arrow(query)
+                logger.info(f"Retrieved {len(df)} rows from database")
+                return df
+            except Exception as e:
+                # e.g. a dynamic column holding mixed value types, which Arrow
+                # can't type as a single column
+                logger.warning(f"Arrow read failed, falling back to sqlite3: {str(e)}")
+        
         try:
             self.connect()
             
-            # Use a more optimized query with limit/offset
-            query = f"SELECT * FROM {self.table_name}"
-            df = pd.read_sql_query(query, self.conn)
+            # Hand pandas the rows and column names directly, rather than going
+            # through read_sql_query's per-row handling
+            self.cursor.execute(query)
+            rows = self.cursor.fetchall()
+            columns = [description[0] for description in self.cursor.description]
+            df = pd.DataFrame.from_records(rows, columns=columns)
             
             logger.info(f"Retrieved {len(df)} rows from database")
             return df
@@ -775,7 +864,7 @@ class DatabaseManager:
                 sanitized_column = self._sanitize_column_name(column)
                 
                 # Add index for this column if it's frequently filtered
-                if column in ['Deal_Stage_Subdirectory_Name', 'Last_Modified_Date']:
+                if sanitized_column in ('Deal_Stage_Subdirectory_Name', 'Last_Modified_Date') + FILTER_INDEX_COLUMNS:
                     self._ensure_index(sanitized_column)
                 
                 if isinstance(value, list):
@@ -933,7 +1022,8 @@ class DatabaseManager:
             
             # Validate columns
             columns = self._get_columns()
-            valid_group_by = [self._sanitize_column_name(col) for col in group_by if self._sanitize_column_name(col) in columns]
+            sanitized_group_by = [self._sanitize_column_name(col) for col in group_by]
+            valid_group_by = [col for col in sanitized_group_by if col in columns]
             
             if not valid_group_by:
                 logger.warning("No valid group by columns provided")
@@ -994,11 +1084,11 @@ class DatabaseManager:
                 LIMIT {limit}
             """
             
-            # Execute query
-            if params:
-                df = pd.read_sql_query(query, self.conn, params=params)
-            else:
-                df = pd.read_sql_query(query, self.conn)
+            # Aggregation runs entirely in SQLite; only the grouped rows come back,
+            # so build the frame straight from the cursor
+            self.cursor.execute(query, params)
+            result_columns = [description[0] for description in self.cursor.description]
+            df = pd.DataFrame(self.cursor.fetchall(), columns=result_columns)
             
             logger.info(f"Retrieved {len(df)} rows of aggregated data")
             return df
@@ -0,0 +1,44 @@
+"""
+SQLite Utilities Module
+
+This module holds connection settings shared by the database modules, so every
+connection factory opening the same database file configures it the same way.
+"""
+
+from pathlib import Path
+from typing import Tuple, Union
+
+def supports_wal(db_path: Union[str, Path]) -> bool:
+    """
+    Check whether WAL journaling is safe for a database file.
+
+    WAL relies on shared memory next to the database, which network shares and
+    cloud-synced folders such as OneDrive don't reliably provide.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        True if WAL can be enabled, False otherwise
+    """
+    path = str(db_path)
+    return not (path.startswith(('\\\\', '//')) or 'onedrive' in path.lower())
+
+def journal_pragmas(db_path: Union[str, Path]) -> Tuple[str, ...]:
+    """
+    Get the PRAGMAs that select the journal mode for a database file.
+
+    The journal mode is stored in the database file itself, so every module
+    connecting to the same file must make the same choice. Files where WAL is
+    unsafe are switched back to rollback journaling in case an earlier
+    connection enabled WAL.
+
+    Args:
+        db_path: Path to the SQLite database file
+
+    Returns:
+        PRAGMA statements to run on each new connection
+    """
+    if supports_wal(db_path):
+        return ("PRAGMA journal_mode = WAL", "PRAGMA synchronous = NORMAL")
+    return ("PRAGMA journal_mode = DELETE",)
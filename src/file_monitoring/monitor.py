@@ -5,24 +5,46 @@ This module provides file system monitoring capabilities to detect changes
 in underwriting files and trigger updates when changes occur.
 """
 
+import heapq
 import logging
 import os
+import queue
+import threading
 import time
 from pathlib import Path
-from typing import List, Callable, Optional, Set
+from typing import Any, Dict, List, Callable, Optional, Set, Tuple
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileModifiedEvent, FileCreatedEvent
 
 from src.config.settings import settings
+from src.data_processing.file_finder import find_uw_model_folder
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of changed files handed to the callback at once
+BATCH_MAX = 100
+
+# Seconds between fallback re-scans of the deal stage directories for new UW
+# Model folders, e.g. ones created inside a deal folder after it was added
+RESCAN_INTERVAL = 3600
+
+# Seconds to wait after a folder appears in a deal stage directory before
+# re-scanning, so a deal folder being copied in has its UW Model folder in place
+REFRESH_DELAY = 5
+
+# Heap size above which superseded debounce entries are compacted away
+HEAP_COMPACT_MIN = 1024
+
 class UWFileHandler(FileSystemEventHandler):
     """
     Event handler for underwriting file changes.
     
     This handler detects changes to Excel files and notifies
     the callback function when relevant files are modified.
+    
+    Events are only queued on the observer thread; a worker thread collects
+    them into batches and runs the callback once per batch, so slow processing
+    never holds up event delivery.
     """
     
     def __init__(
@@ -41,23 +63,60 @@ class UWFileHandler(FileSystemEventHandler):
             file_excludes: List of strings that exclude a file if in filename
             callback: Function to call when relevant files change
         """
-        self.file_types = [ft.lower() for ft in file_types]
+        self.file_types = tuple(ft.lower() for ft in file_types)
+        self._file_type_set = frozenset(self.file_types)
         self.file_includes = file_includes
         self.file_excludes = file_excludes
+        # Lowercased once here rather than on every event
+        self._includes_lower = tuple(inc.lower() for inc in file_includes)
+        self._excludes_lower = tuple(exc.lower() for exc in file_excludes)
         self.callback = callback
-        self.changed_files: Set[str] = set()
-        self.last_event_time = time.time()
         self.cooldown_period = 5  # seconds to wait after last event before processing
+        
+        # (file path, event time, moved-from path) tuples, or None to stop the worker
+        self._queue: "queue.Queue[Optional[Tuple[str, float, Optional[str]]]]" = queue.Queue()
+        
+        # Debounce state, only touched by the worker: a min-heap of (ready time,
+        # path) and each path's latest ready time. Heap entries superseded by a
+        # newer event are skipped when popped rather than removed.
+        self._heap: List[Tuple[float, str]] = []
+        self._pending: Dict[str, float] = {}
+        
+        self._worker = threading.Thread(target=self._drain, daemon=True)
+        self._worker.start()
     
     def on_modified(self, event):
         """Handle file modified events."""
         if not event.is_directory and self._is_relevant_file(event.src_path):
-            self._handle_file_change(event.src_path)
+            self._queue.put((event.src_path, time.monotonic(), None))
     
     def on_created(self, event):
         """Handle file created events."""
         if not event.is_directory and self._is_relevant_file(event.src_path):
-            self._handle_file_change(event.src_path)
+            self._queue.put((event.src_path, time.monotonic(), None))
+    
+    def on_moved(self, event):
+        """
+        Handle file moved events.
+        
+        Excel saves by writing a temporary file and renaming it over the
+        workbook, so the destination is treated as changed and any pending
+        event for the source is dropped.
+        """
+        if not event.is_directory and self._is_relevant_file(event.dest_path):
+            self._queue.put((event.dest_path, time.monotonic(), event.src_path))
+    
+    def queue_files(self, file_paths: List[str]) -> None:
+        """
+        Schedule the relevant files among the given paths as if they had changed.
+        
+        Args:
+            file_paths: Paths of the files to check
+        """
+        event_time = time.monotonic()
+        for file_path in file_paths:
+            if self._is_relevant_file(file_path):
+                self._queue.put((file_path, event_time, None))
     
     def _is_relevant_file(self, file_path: str) -> bool:
         """
@@ -69,61 +128,163 @@ class UWFileHandler(FileSystemEventHandler):
         Returns:
             True if the file should be monitored, False otherwise
         """
-        path = Path(file_path)
-        file_ext = path.suffix.lower()
-        file_name = path.name.lower()
+        # Check file extension, lowercasing only the extension so that most
+        # irrelevant events are rejected without touching the rest of the path
+        ext_start = file_path.rfind('.')
+        if ext_start < 0 or file_path[ext_start:].lower() not in self._file_type_set:
+            return False
         
-        # Check file extension
-        if file_ext not in self.file_types:
+        file_name = os.path.basename(file_path).lower()
+        
+        # Skip Office lock files (~$Book.xlsb)
+        if file_name.startswith('~$'):
             return False
             
         # Check includes
-        if self.file_includes and not any(inc.lower() in file_name for inc in self.file_includes):
+        if self._includes_lower and not any(inc in file_name for inc in self._includes_lower):
             return False
             
         # Check excludes
-        if any(exc.lower() in file_name for exc in self.file_excludes):
+        if any(exc in file_name for exc in self._excludes_lower):
             return False
             
         return True
     
-    def _handle_file_change(self, file_path: str) -> None:
+    def _add_event(self, file_path: str, event_time: float, moved_from: Optional[str] = None) -> None:
         """
-        Handle a file change event.
-        
-        This adds the file to the changed files set and schedules a callback
-        if one isn't already scheduled.
+        Schedule a file for processing once the cooldown after its latest event ends.
         
         Args:
-            file_path: Path to the changed file
+            file_path: Path of the changed file
+            event_time: Monotonic time of the event
+            moved_from: Previous path if the file was renamed to file_path
         """
-        self.changed_files.add(file_path)
-        self.last_event_time = time.time()
+        if moved_from is not None:
+            # The old path no longer exists; its heap entry is skipped when popped
+            self._pending.pop(moved_from, None)
+        ready_at = event_time + self.cooldown_period
+        self._pending[file_path] = ready_at
+        heapq.heappush(self._heap, (ready_at, file_path))
         
-    def process_pending_changes(self) -> None:
+        # Superseded entries normally wait in the heap until their cooldown
+        # ends; when they dominate it, rebuild from the live entries instead
+        if len(self._heap) > HEAP_COMPACT_MIN and len(self._heap) > 2 * len(self._pending):
+            self._heap = [(ready_at, file_path) for file_path, ready_at in self._pending.items()]
+            heapq.heapify(self._heap)
+    
+    def get_ready_files(self, now: float) -> List[str]:
         """
-        Process any pending file changes.
+        Pop the files whose cooldown has ended.
         
-        This checks if the cooldown period has elapsed since the last event,
-        and if so, calls the callback with the list of changed files and clears
-        the set.
-        """
-        if not self.changed_files:
-            return
+        Only the ready entries at the head of the heap are visited.
+        
+        Args:
+            now: Current monotonic time
             
-        # If enough time has passed since the last event
-        if time.time() - self.last_event_time >= self.cooldown_period:
+        Returns:
+            Paths of the files ready to process
+        """
+        ready_files = []
+        while self._heap and self._heap[0][0] <= now:
+            ready_at, file_path = heapq.heappop(self._heap)
+            # Skip entries rescheduled by a later event
+            if self._pending.get(file_path) == ready_at:
+                del self._pending[file_path]
+                ready_files.append(file_path)
+        return ready_files
+    
+    def _drain(self) -> None:
+        """
+        Debounce queued events and process files as their cooldowns end.
+        
+        The worker sleeps until the next event arrives or the earliest pending
+        cooldown ends, and hands ready files to the callback in batches of up
+        to BATCH_MAX.
+        """
+        while True:
+            timeout = max(0.0, self._heap[0][0] - time.monotonic()) if self._heap else None
             try:
-                # Make a copy and clear the set to avoid missing events during callback
-                changed_files = list(self.changed_files)
-                self.changed_files.clear()
-                
-                # Call the callback
-                logger.info(f"Processing {len(changed_files)} changed files")
-                self.callback(changed_files)
-                
-            except Exception as e:
-                logger.error(f"Error processing file changes: {str(e)}", exc_info=True)
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            
+            if item is None:
+                # Stopping: process everything still pending
+                if self._pending:
+                    self._process_batch(sorted(self._pending))
+                return
+            if item:
+                self._add_event(*item)
+            
+            ready_files = self.get_ready_files(time.monotonic())
+            for i in range(0, len(ready_files), BATCH_MAX):
+                self._process_batch(ready_files[i:i + BATCH_MAX])
+    
+    def _process_batch(self, changed_files: List[str]) -> None:
+        """
+        Call the callback with a batch of changed files.
+        
+        Args:
+            changed_files: Paths of the changed files
+        """
+        try:
+            logger.info(f"Processing {len(changed_files)} changed files")
+            self.callback(changed_files)
+        except Exception as e:
+            logger.error(f"Error processing file changes: {str(e)}", exc_info=True)
+    
+    def stop(self) -> None:
+        """Process any batch in progress, then stop the worker thread."""
+        self._queue.put(None)
+
+class StageDirectoryHandler(FileSystemEventHandler):
+    """
+    Event handler for new folders in the deal stage directories.
+    
+    The stage directories are watched non-recursively, so this only sees deal
+    folders being created or renamed, and asks for a re-scan of the UW Model
+    folders when one is.
+    """
+    
+    def __init__(self, on_new_folder: Callable[[], None]):
+        """
+        Initialize the stage directory handler.
+        
+        Args:
+            on_new_folder: Function to call when a folder is created or renamed
+        """
+        self.on_new_folder = on_new_folder
+    
+    def on_created(self, event):
+        """Handle directory created events."""
+        if event.is_directory:
+            self.on_new_folder()
+    
+    def on_moved(self, event):
+        """Handle directory moved events, e.g. a new folder being renamed."""
+        if event.is_directory:
+            self.on_new_folder()
+
+def _create_observer() -> Observer:
+    """
+    Create the watchdog observer for this platform and log which backend it uses.
+    
+    watchdog's Observer already picks the native backend (inotify on Linux,
+    ReadDirectoryChangesW on Windows, FSEvents on macOS) and only falls back to
+    polling when none is available. On Linux, bursts of saves that overflow the
+    kernel queue are dropped; raise fs.inotify.max_queued_events with sysctl if
+    overflow warnings show up in the log.
+    
+    Returns:
+        Observer instance
+    """
+    observer = Observer()
+    backend = type(observer).__name__
+    if backend == "PollingObserver":
+        logger.warning("No native file system events available, falling back to polling")
+    else:
+        logger.info(f"Using {backend} for file system events")
+    return observer
 
 class FileMonitor:
     """
@@ -157,35 +318,111 @@ class FileMonitor:
         self.file_excludes = file_excludes or settings.file_excludes
         self.callback = callback or self._default_callback
         
-        self.observer = Observer()
+        self.observer = _create_observer()
         self.handler = UWFileHandler(
             self.file_types,
             self.file_includes,
             self.file_excludes,
             self.callback
         )
+        self.stage_handler = StageDirectoryHandler(self._request_refresh)
         self.is_running = False
+        self._stop_event = threading.Event()
+        # Set when a new folder in a stage directory calls for an early re-scan
+        self._refresh_event = threading.Event()
+        # Watched UW Model folder -> watchdog watch handle
+        self._watches: Dict[str, Any] = {}
+    
+    def _find_watch_dirs(self) -> Set[str]:
+        """
+        Find the UW Model folders of every deal in the monitored directories.
+        
+        Returns:
+            Set of UW Model folder paths
+        """
+        watch_dirs = set()
+        for directory in self.directories:
+            try:
+                deal_folders = [folder for folder in Path(directory).iterdir() if folder.is_dir()]
+            except OSError as e:
+                logger.warning(f"Could not scan directory {directory}: {str(e)}")
+                continue
+            
+            for deal_folder in deal_folders:
+                try:
+                    uw_model_folder = find_uw_model_folder(deal_folder)
+                except OSError as e:
+                    logger.warning(f"Could not scan deal folder {deal_folder}: {str(e)}")
+                    continue
+                if uw_model_folder:
+                    watch_dirs.add(str(uw_model_folder))
+        return watch_dirs
+    
+    def _refresh_watches(self) -> None:
+        """
+        Watch newly found UW Model folders and drop watches on ones that are gone.
+        
+        Files already in a folder found after startup are queued as changed,
+        since they were saved before the folder was watched.
+        """
+        watch_dirs = self._find_watch_dirs()
+        
+        for directory in self._watches.keys() - watch_dirs:
+            logger.info(f"No longer watching directory: {directory}")
+            self.observer.unschedule(self._watches.pop(directory))
+        
+        for directory in watch_dirs - self._watches.keys():
+            logger.info(f"Watching directory: {directory}")
+            self._watches[directory] = self.observer.schedule(self.handler, directory, recursive=False)
+            
+            if self.is_running:
+                # Listed after the watch is in place, so no save falls in between;
+                # a file seen both ways is debounced into one change
+                try:
+                    with os.scandir(directory) as entries:
+                        file_paths = [entry.path for entry in entries if entry.is_file()]
+                except OSError as e:
+                    logger.warning(f"Could not list directory {directory}: {str(e)}")
+                    continue
+                self.handler.queue_files(file_paths)
+    
+    def _request_refresh(self) -> None:
+        """Wake the monitoring loop to re-scan for UW Model folders."""
+        self._refresh_event.set()
     
     def start(self) -> None:
         """Start monitoring the configured directories."""
         try:
-            # Set up observers for each directory
             for directory in self.directories:
-                if os.path.isdir(directory):
-                    logger.info(f"Watching directory: {directory}")
-                    self.observer.schedule(self.handler, directory, recursive=True)
-                else:
-                    logger.warning(f"Directory not found: {directory}")
+                logger.info(f"Monitoring deal stage directory: {directory}")
+            
+            # Only the UW Model folders hold underwriting files, so watch those
+            # non-recursively instead of receiving every event under each stage
+            self._refresh_watches()
+            
+            # Watch the stage directories themselves, non-recursively, for new deal folders
+            for directory in self.directories:
+                self.observer.schedule(self.stage_handler, directory, recursive=False)
             
             # Start the observer
             self.observer.start()
             self.is_running = True
             
-            # Check for pending changes periodically
+            # Changes are processed by the handler's worker thread, which wakes
+            # only for new events or expiring cooldowns. Block here until
+            # stopped, re-scanning when a deal folder appears and now and then
+            # in case a UW Model folder was added without one.
             try:
-                while self.is_running:
-                    self.handler.process_pending_changes()
-                    time.sleep(1)
+                while not self._stop_event.is_set():
+                    if self._refresh_event.wait(RESCAN_INTERVAL):
+                        # Let a folder being copied in settle before scanning it
+                        if self._stop_event.wait(REFRESH_DELAY):
+                            break
+                    self._refresh_event.clear()
+                    try:
+                        self._refresh_watches()
+                    except Exception as e:
+                        logger.error(f"Error refreshing watched directories: {str(e)}", exc_info=True)
             except KeyboardInterrupt:
                 self.stop()
                 
@@ -196,8 +433,11 @@ class FileMonitor:
     def stop(self) -> None:
         """Stop monitoring."""
         self.is_running = False
+        self._stop_event.set()
+        self._refresh_event.set()
         self.observer.stop()
         self.observer.join()
+        self.handler.stop()
         logger.info("File monitoring stopped")
     
     def _default_callback(self, changed_files: List[str]) -> None:
@@ -19,6 +19,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger('task_scheduler_setup')
 
+# schtasks writes its output in the ANSI code page on Windows
+OUTPUT_ENCODING = "mbcs" if sys.platform == "win32" else "utf-8"
+
+def _decode_output(output):
+    """
+    Decode captured command output for logging.
+    
+    Output is captured as bytes and only decoded when it is actually logged.
+    
+    Args:
+        output: Raw bytes captured from the command
+    
+    Returns:
+        Decoded text, with undecodable bytes replaced
+    """
+    return output.decode(OUTPUT_ENCODING, errors="replace")
+
 def create_task(task_name="UnderwritingMonitor", run_at_startup=True, run_as_user=True):
     """
     Create a scheduled task to run the file monitoring script.
@@ -65,14 +82,15 @@ def create_task(task_name="UnderwritingMonitor", run_at_startup=True, run_as_use
         
         # Run the command
         logger.info(f"Running command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True)
         
         if result.returncode == 0:
             logger.info(f"Task '{task_name}' created successfully")
-            logger.info(result.stdout)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(_decode_output(result.stdout))
             return True
         else:
-            logger.error(f"Failed to create task: {result.stderr}")
+            logger.error(f"Failed to create task: {_decode_output(result.stderr)}")
             return False
     
     except Exception as e:
@@ -93,13 +111,13 @@ def delete_task(task_name="UnderwritingMonitor"):
         cmd = ["schtasks", "/Delete", "/F", "/TN", task_name]
         
         logger.info(f"Running command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(cmd, capture_output=True)
         
         if result.returncode == 0:
             logger.info(f"Task '{task_name}' deleted successfully")
             return True
         else:
-            logger.error(f"Failed to delete task: {result.stderr}")
+            logger.error(f"Failed to delete task: {_decode_output(result.stderr)}")
             return False
     
     except Exception as e:
@@ -7,11 +7,21 @@ excel_reader components.
 """
 
 import logging
+import os
+import stat
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Dict, List, Tuple, Any, Optional
 import pandas as pd
 from pathlib import Path
 
-from src.data_processing.file_finder import find_underwriting_files
+from src.data_processing.file_finder import (
+    find_underwriting_files,
+    get_deal_stage_dir,
+    MIN_MTIME_NS,
+    meets_file_criteria_cached,
+    collect_file_metadata_cached
+)
 from src.data_processing.excel_reader_optimized import process_excel_files
 from src.database.db_manager_optimized import store_data, process_excel_batch
 
@@ -94,6 +104,66 @@ class FileService:
             logger.error(f"Error updating database: {str(e)}", exc_info=True)
             return False
             
+    @staticmethod
+    def update_changed_files(file_paths: List[str]) -> bool:
+        """
+        Process only the given changed files and store them in one batch.
+        
+        Args:
+            file_paths: Paths of files reported as changed
+            
+        Returns:
+            True if the database was successfully updated, False otherwise
+        """
+        try:
+            file_list = []
+            for file_path in file_paths:
+                path = Path(file_path)
+                try:
+                    st = path.stat()
+                except OSError:
+                    # Deleted or renamed since the event
+                    continue
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                
+                # Stale files would fail the criteria check anyway; reject them
+                # on the stat already taken before any other lookups
+                if st.st_mtime_ns < MIN_MTIME_NS:
+                    logger.debug("File last modified before the minimum date: %s", file_path)
+                    continue
+                
+                # Criteria and metadata are cached per (path, mtime, size), so
+                # repeated events for an unchanged file skip the work
+                cache_key = (str(path), st.st_mtime_ns, st.st_size)
+                deal_stage_dir = get_deal_stage_dir(path)
+                if deal_stage_dir is None or not meets_file_criteria_cached(*cache_key):
+                    logger.debug("File does not meet criteria: %s", file_path)
+                    continue
+                
+                file_metadata = collect_file_metadata_cached(
+                    cache_key[0], str(deal_stage_dir), *cache_key[1:]
+                )
+                if file_metadata:
+                    file_list.append(file_metadata)
+            
+            if not file_list:
+                logger.info("No changed files to process")
+                return False
+            
+            data = FileService.process_files(file_list)
+            if data.empty:
+                logger.warning("No data extracted from changed files")
+                return False
+            
+            store_data(data)
+            logger.info(f"Successfully updated database with {len(data)} changed records")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error updating changed files: {str(e)}", exc_info=True)
+            return False
+    
     @staticmethod
     def batch_process_files(max_files: int = None) -> bool:
         """
@@ -118,25 +188,21 @@ class FileService:
                 
             logger.info(f"Batch processing {len(included_files)} files")
             
-            # Process files in smaller chunks for memory efficiency
-            chunk_size = 5  # Process 5 files at a time
-            dataframes = []
+            # Parse chunks of files across one shared process pool. Each worker
+            # reads its chunk sequentially, so no nested pools are spawned and
+            # the pool is not torn down and recreated per chunk.
+            chunk_size = 5
+            chunks = [included_files[i:i+chunk_size] for i in range(0, len(included_files), chunk_size)]
+            read_chunk = partial(process_excel_files, parallel=False)
             
-            for i in range(0, len(included_files), chunk_size):
-                chunk = included_files[i:i+chunk_size]
-                logger.info(f"Processing chunk of {len(chunk)} files ({i+1}-{i+len(chunk)} of {len(included_files)})")
-                
-                # Process this chunk of files
-                chunk_data = FileService.process_files(chunk)
-                
-                if not chunk_data.empty:
-                    dataframes.append(chunk_data)
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(chunks))) as executor:
+                dataframes = [chunk_data for chunk_data in executor.map(read_chunk, chunks) if not chunk_data.empty]
             
             if not dataframes:
                 logger.warning("No data extracted from any files")
                 return False
                 
-            # Use the batch processing feature for better performance
+            # Concatenate once and store everything in a single batch
             result = process_excel_batch(dataframes)
             
             if result:
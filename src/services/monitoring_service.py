@@ -106,8 +106,8 @@ class MonitoringService:
         try:
             logger.info(f"Detected changes in {len(changed_files)} files")
             
-            # Update the database with the latest data
-            success = FileService.update_database()
+            # Update the database with just the changed files
+            success = FileService.update_changed_files(changed_files)
             
             if success:
                 logger.info("Database updated successfully after file changes")
@@ -0,0 +1,115 @@
+# Tests for the search index, its triggers and the UPSERT store path
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from src.database import db_manager
+from src.database.db_manager import DATABASE_TABLE, DatabaseManager
+
+FTS_TABLE = f"{DATABASE_TABLE}_fts"
+
+pytestmark = pytest.mark.skipif(
+    not db_manager.TRIGRAM_SUPPORT, reason="SQLite without the FTS5 trigram tokenizer"
+)
+
+
+def make_records(**columns):
+    """Build a two-file batch with the core columns store_data expects."""
+    data = {
+        "File Name": ["phoenix_flats.xlsb", "tempe_row.xlsb"],
+        "Absolute File Path": ["/deals/a/phoenix_flats.xlsb", "/deals/b/tempe_row.xlsb"],
+        "Deal Stage Subdirectory Name": ["1) Initial UW and Review", "2) Active UW and Review"],
+        "Deal Stage Subdirectory Path": ["/deals/a", "/deals/b"],
+        "Last Modified Date": ["2024-01-01T00:00:00", "2024-01-02T00:00:00"],
+        "File Size in Bytes": [100, 200],
+        "Property Name": ["Camelback Flats", "Mill Avenue Row"],
+        "Units": [120, 80],
+    }
+    data.update(columns)
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A DatabaseManager on a fresh database holding one stored batch."""
+    manager = DatabaseManager(tmp_path / "test.db")
+    manager.setup_database()
+    manager.store_data(make_records())
+    # Property_Name was added by the batch, so the index catches up on setup
+    manager.setup_database()
+    return manager
+
+
+def search(db, term):
+    return sorted(db.search_data(term)["File_Name"])
+
+
+def fts_columns(db):
+    db.connect()
+    try:
+        return db._get_fts_columns()
+    finally:
+        db.disconnect()
+
+
+def test_index_covers_existing_search_columns(db):
+    assert set(fts_columns(db)) == {
+        "File_Name", "Deal_Stage_Subdirectory_Name", "Property_Name"
+    }
+
+
+def test_search_matches_substrings_of_data_columns(db):
+    assert search(db, "Camelback") == ["phoenix_flats.xlsb"]
+    assert search(db, "avenue") == ["tempe_row.xlsb"]
+    assert search(db, "xlsb") == ["phoenix_flats.xlsb", "tempe_row.xlsb"]
+    assert search(db, "nothing like this") == []
+
+
+def test_short_terms_use_like(db):
+    assert search(db, "Mi") == ["tempe_row.xlsb"]
+
+
+def test_search_ignores_unsearchable_columns(db):
+    # Units isn't one of SEARCH_COLUMNS
+    assert search(db, "120") == []
+
+
+def test_stale_index_falls_back_to_like(db):
+    db.store_data(make_records(Market=["Phoenix", "Tempe"]))
+    assert "Market" not in fts_columns(db)
+    assert search(db, "Tempe") == ["tempe_row.xlsb"]
+
+    db.setup_database()
+    assert "Market" in fts_columns(db)
+    assert search(db, "Tempe") == ["tempe_row.xlsb"]
+
+
+def test_upsert_updates_rows_and_index(db):
+    db.store_data(make_records(**{"Property Name": ["Camelback Lofts", "Mill Avenue Row"]}))
+
+    conn = sqlite3.connect(db.db_path)
+    try:
+        rows = conn.execute(
+            f"SELECT Absolute_File_Path, Property_Name FROM {DATABASE_TABLE} ORDER BY id"
+        ).fetchall()
+        # Raises if the index no longer matches the table contents
+        conn.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('integrity-check', 1)"
+        )
+    finally:
+        conn.close()
+
+    assert rows == [
+        ("/deals/a/phoenix_flats.xlsb", "Camelback Lofts"),
+        ("/deals/b/tempe_row.xlsb", "Mill Avenue Row"),
+    ]
+    assert search(db, "Lofts") == ["phoenix_flats.xlsb"]
+    assert search(db, "Camelback Flats") == []
+
+
+def test_delete_removes_row_from_index(db):
+    assert db.delete_record("/deals/b/tempe_row.xlsb")
+    assert search(db, "avenue") == []
+    assert search(db, "xlsb") == ["phoenix_flats.xlsb"]